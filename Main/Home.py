@@ -1,4 +1,5 @@
 import streamlit as st
+from warmup import start_readiness_server, start_warmup
 
 # Page config
 st.set_page_config(
@@ -7,6 +8,11 @@ st.set_page_config(
     layout="wide"
 )
 
+# Preload the model and indexes for every page; a no-op once this process
+# has started warming up (e.g. from `python warmup.py`)
+start_readiness_server()
+start_warmup()
+
 # Simple custom CSS for minimal styling
 st.markdown("""
 <style>
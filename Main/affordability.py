@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+from finance import max_loan
+from price_model import affordable_areas
+
+MIN_SQFT_PER_BHK = 300  # smaller homes are treated as unrealistic for the BHK count
+CONFIGURATIONS = ((1, 1), (2, 2), (3, 2), (4, 3))  # (bhk, bath)
+
+def max_property_price(monthly_income, foir, rate, tenure, down_payment, existing_emi=0):
+    """Maximum loan and property price (₹) a borrower qualifies for.
+
+    The EMI budget is the FOIR share (%) of monthly income less existing
+    EMIs; inverting the EMI formula gives the loan, and the down payment
+    (% of the price) covers the rest. Every argument may be an array.
+    """
+    payment = np.maximum(np.asarray(monthly_income, dtype=float) * foir / 100 - existing_emi, 0)
+    loan = max_loan(payment, rate, tenure)
+    return loan, loan / (1 - np.asarray(down_payment, dtype=float) / 100)
+
+def feasible_homes(model, location_map, prices, tenures, configurations=CONFIGURATIONS):
+    """Every (tenure, location, BHK) the prices (₹, one per tenure) can buy.
+
+    Areas for all tenures, configurations and locations come from one
+    broadcast over the model coefficients. Rows below MIN_SQFT_PER_BHK per
+    bedroom are dropped.
+    """
+    loc_indices = np.array(list(location_map.keys()))
+    bhks, baths = zip(*configurations)
+    areas = affordable_areas(model, loc_indices, np.asarray(prices) / 100000, bhks, baths)
+
+    t, c, l = np.indices(areas.shape)
+    homes = pd.DataFrame({
+        'tenure': np.asarray(tenures)[t.ravel()],
+        'location': np.array(list(location_map.values()))[l.ravel()],
+        'bhk': np.asarray(bhks)[c.ravel()],
+        'bath': np.asarray(baths)[c.ravel()],
+        'max_area': areas.ravel(),
+    })
+    return homes[homes['max_area'] >= MIN_SQFT_PER_BHK * homes['bhk']].reset_index(drop=True)
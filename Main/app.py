@@ -1,7 +1,10 @@
 import streamlit as st
-import pickle
 import numpy as np
-from pathlib import Path
+from model_registry import get_registry
+from price_model import prediction_interval
+from locality_search import model_locations, search_index
+from prediction_log import log_prediction
+from page_profiler import run_page
 
 # Page config
 st.set_page_config(
@@ -48,26 +51,14 @@ st.markdown("""
 def load_model():
     """Load the pre-trained model"""
     try:
-        model_path = Path(__file__).parent.parent / 'banglore_home_prices_model.pickle'
-        with open(model_path, 'rb') as f:
-            model = pickle.load(f)
-        return model
+        return get_registry()
     except Exception as e:
         st.error(f"Failed to load model: {str(e)}")
         return None
 
-def get_location_map():
-    """Map location indices to readable names"""
-    return {
-        0: "Whitefield", 10: "HSR Layout", 20: "Electronic City", 
-        30: "Marathahalli", 40: "Koramangala", 50: "Indiranagar", 
-        60: "JP Nagar", 70: "Bannerghatta Road", 80: "Sarjapur Road", 
-        90: "Hebbal", 100: "Banashankari", 110: "BTM Layout", 
-        120: "Jayanagar", 130: "Bellandur", 140: "CV Raman Nagar",
-        150: "Malleswaram", 160: "Old Airport Road", 170: "Rajaji Nagar", 
-        180: "Yelahanka", 190: "KR Puram", 200: "Mahadevapura", 
-        210: "Thanisandra", 220: "Kengeri", 230: "Hoodi"
-    }
+def get_location_map(model):
+    """Map location indices to the model's locality names"""
+    return dict(enumerate(model_locations(model.production)))
 
 def format_price(price):
     """Format price in lakhs with Indian number system"""
@@ -138,11 +129,17 @@ def main():
         
         st.markdown("<br>", unsafe_allow_html=True)
         
-        # Location dropdown
-        locations = sorted(get_location_map().values())
+        # Location search and dropdown
+        locations = get_location_map(model).values()
+        query = st.text_input(
+            "🔎 Search location",
+            placeholder="Start typing, e.g. Koramangala",
+            help="Typos are fine - the closest localities are suggested"
+        )
+        options = search_index(tuple(locations)).search(query, limit=50) if query else sorted(locations)
         location = st.selectbox(
             "📍 Location",
-            options=locations,
+            options=options or sorted(locations),
             help="Select the location in Bangalore"
         )
         
@@ -157,7 +154,7 @@ def main():
     if predict_button:
         try:
             # Prepare input features
-            x = np.zeros(244)  # Model expects 244 features
+            x = np.zeros(model.production.n_features_in_)  # 244 features for the base model
             
             # Set basic features
             x[0] = area
@@ -165,7 +162,7 @@ def main():
             x[2] = bhk
             
             # Set location feature
-            location_map_inv = {v: k for k, v in get_location_map().items()}
+            location_map_inv = {v: k for k, v in get_location_map(model).items()}
             loc_index = location_map_inv[location]
             x[3 + loc_index] = 1
             
@@ -187,6 +184,12 @@ def main():
                 # Display predicted price with larger font
                 st.markdown(f"<h2 style='color: #1E88E5; margin-top: 1rem;'>Estimated Price: {format_price(predicted_price)}</h2>", 
                           unsafe_allow_html=True)
+                
+                interval = prediction_interval(model.production, x)
+                if interval is not None:
+                    low, high = interval
+                    st.markdown(f"**95% range:** {format_price(max(low, 0))} – {format_price(high)}")
+            log_prediction('app', model, location, area, bhk, bath, predicted_price, interval)
             
             # Add disclaimer
             st.info("Note: This is an estimated price based on historical data and may vary from actual market prices.")
@@ -195,4 +198,4 @@ def main():
             st.error(f"An error occurred: {str(e)}")
 
 if __name__ == "__main__":
-    main()
+    run_page(main, "Price Predictor")
@@ -0,0 +1,93 @@
+import sys
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from scipy.spatial import cKDTree
+from price_index import prepare_listings
+
+COMPARABLES_DIR = Path(__file__).parent.parent / 'comparables_index'
+FEATURES = ('total_sqft', 'bhk', 'bath')
+COLUMNS = FEATURES + ('price',)
+
+def build_comparables(listings, path=COMPARABLES_DIR):
+    """Write listings as location-partitioned arrays that can be memory-mapped.
+
+    Rows are sorted by location so each location is a contiguous slice given
+    by `offsets`. Features are scaled by their standard deviation so a KD-tree
+    distance weighs area, BHK and bathrooms comparably.
+    """
+    df = prepare_listings(listings, required=('location',) + COLUMNS)
+    df = df.sort_values('location', kind='stable')
+
+    features = df[list(FEATURES)].to_numpy(dtype=np.float64)
+    scale = features.std(axis=0)
+    scale[scale == 0] = 1.0
+
+    locations, offsets = np.unique(df['location'].to_numpy(dtype=str), return_index=True)
+
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    np.save(path / 'points.npy', features / scale)
+    np.save(path / 'scale.npy', scale)
+    np.save(path / 'listings.npy', df[list(COLUMNS)].to_numpy(dtype=np.float64))
+    np.save(path / 'locations.npy', locations)
+    np.save(path / 'offsets.npy', np.append(offsets, len(df)))
+    return len(df)
+
+class ComparablesIndex:
+    """Nearest comparable listings per location over memory-mapped arrays.
+
+    The arrays are opened read-only with mmap, so several worker processes
+    share the same pages. KD-trees are built per location on first use and
+    reference the mapped points without copying.
+    """
+
+    def __init__(self, path=COMPARABLES_DIR):
+        path = Path(path)
+        self.points = np.load(path / 'points.npy', mmap_mode='r')
+        self.listings = np.load(path / 'listings.npy', mmap_mode='r')
+        self.scale = np.load(path / 'scale.npy')
+        offsets = np.load(path / 'offsets.npy')
+        locations = np.load(path / 'locations.npy')
+        self._slices = {
+            location: slice(int(start), int(end))
+            for location, start, end in zip(locations, offsets[:-1], offsets[1:])
+        }
+        self._trees = {}
+
+    def _tree(self, location):
+        tree = self._trees.get(location)
+        if tree is None:
+            tree = cKDTree(self.points[self._slices[location]], copy_data=False)
+            self._trees[location] = tree
+        return tree
+
+    def similar(self, location, area, bhk, bath, k=5):
+        """Return the k listings in a location closest to the given property"""
+        if location not in self._slices:
+            return pd.DataFrame(columns=list(COLUMNS) + ['distance'])
+
+        rows = self._slices[location]
+        k = min(k, rows.stop - rows.start)
+        query = np.array([area, bhk, bath], dtype=np.float64) / self.scale
+        distances, positions = self._tree(location).query(query, k=k)
+        distances, positions = np.atleast_1d(distances), np.atleast_1d(positions)
+
+        result = pd.DataFrame(self.listings[rows.start + positions], columns=list(COLUMNS))
+        result['distance'] = distances
+        return result
+
+def load_comparables(path=COMPARABLES_DIR):
+    """Open a built comparables index, or None if it hasn't been built yet"""
+    if not (Path(path) / 'points.npy').exists():
+        return None
+    return ComparablesIndex(path)
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python comparables.py <listings.csv> [output_dir]")
+        sys.exit(1)
+
+    output = sys.argv[2] if len(sys.argv) > 2 else COMPARABLES_DIR
+    count = build_comparables(pd.read_csv(sys.argv[1]), output)
+    print(f"Indexed {count} listings to {output}")
@@ -0,0 +1,144 @@
+import numpy as np
+
+def emi(principal, rate, tenure):
+    """Monthly EMI for an annual rate (%) and tenure (years); accepts arrays"""
+    rate = np.asarray(rate, dtype=float) / (12 * 100)
+    months = np.asarray(tenure, dtype=float) * 12
+    growth = (1 + rate) ** months
+    with np.errstate(divide='ignore', invalid='ignore'):
+        payment = principal * rate * growth / (growth - 1)
+    # A zero rate leaves plain repayment of the principal
+    return np.where(rate == 0, principal / months, payment)
+
+def max_loan(payment, rate, tenure):
+    """Largest principal a monthly EMI can service; the inverse of `emi`"""
+    rate = np.asarray(rate, dtype=float) / (12 * 100)
+    months = np.asarray(tenure, dtype=float) * 12
+    growth = (1 + rate) ** months
+    with np.errstate(divide='ignore', invalid='ignore'):
+        principal = payment * (growth - 1) / (rate * growth)
+    return np.where(rate == 0, payment * months, principal)
+
+def roi(purchase_price, current_value, monthly_rent, years):
+    """Total return on investment (%) including rent; accepts arrays"""
+    total_return = current_value - purchase_price + monthly_rent * 12 * years
+    return total_return / purchase_price * 100
+
+def rental_yield(property_value, monthly_rent):
+    """Annual rental yield (%); accepts arrays"""
+    return monthly_rent * 12 / property_value * 100
+
+def outstanding_balance(principal, rate, tenure, months_paid):
+    """Loan balance left after some EMIs have been paid; accepts arrays"""
+    rate = np.asarray(rate, dtype=float) / (12 * 100)
+    n = np.asarray(tenure, dtype=float) * 12
+    k = np.minimum(months_paid, n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        balance = principal * ((1 + rate) ** n - (1 + rate) ** k) / ((1 + rate) ** n - 1)
+    return np.where(rate == 0, principal * (1 - k / n), balance)
+
+def property_cash_flows(purchase_price, down_payment, loan_rate, tenure, monthly_rent, years, sale_price):
+    """Monthly cash flows of buying, renting out and selling a property.
+
+    Every argument may be an array, one value per scenario. Returns an array
+    of shape (scenarios, months + 1): month 0 pays the down payment (% of
+    the purchase price), each month then collects rent less the EMI, and the
+    last month of each scenario's holding period adds the sale price less
+    the loan still outstanding. Months past a scenario's period are zero.
+    """
+    purchase_price, down_payment, loan_rate, tenure, monthly_rent, years, sale_price = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(v, dtype=float)) for v in
+          (purchase_price, down_payment, loan_rate, tenure, monthly_rent, years, sale_price))
+    )
+    loan = purchase_price * (1 - down_payment / 100)
+    payment = np.where(loan > 0, emi(loan, loan_rate, tenure), 0.0)
+    holding = np.round(years * 12).astype(int)
+
+    months = np.arange(holding.max() + 1)[None, :]
+    held = (months >= 1) & (months <= holding[:, None])
+    paying = months <= tenure[:, None] * 12
+    flows = np.where(held, monthly_rent[:, None] - np.where(paying, payment[:, None], 0.0), 0.0)
+    flows[:, 0] = -(purchase_price - loan)
+
+    exit_value = sale_price - outstanding_balance(loan, loan_rate, tenure, holding)
+    flows[np.arange(len(flows)), holding] += exit_value
+    return flows
+
+def npv(rate, cash_flows, times=None, periods_per_year=12):
+    """Net present value at an annual discount rate (fraction) for each scenario.
+
+    `cash_flows` is (scenarios, periods); `times` gives each flow's time in
+    years (defaults to evenly spaced periods), so irregular XNPV-style flows
+    share the same code.
+    """
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    times = _flow_times(cash_flows, times, periods_per_year)
+    rate = np.asarray(rate, dtype=float).reshape(-1, 1)
+    return (cash_flows * (1 + rate) ** -times).sum(axis=1)
+
+def _flow_times(cash_flows, times, periods_per_year):
+    if times is None:
+        return np.arange(cash_flows.shape[1]) / periods_per_year
+    return np.atleast_2d(np.asarray(times, dtype=float))
+
+def irr(cash_flows, times=None, periods_per_year=12, tol=1e-10, max_iter=100):
+    """Annual internal rate of return (fraction) for many scenarios at once.
+
+    Runs Newton's method on every scenario together inside a bracket that
+    starts at (-99%, 1000%) and shrinks around the NPV sign change. A step
+    that would leave the bracket, or that isn't shrinking fast enough,
+    bisects instead (as in rtsafe), so every scenario converges even where
+    Newton alone would overshoot. Only unconverged scenarios are evaluated
+    on each pass. Scenarios with no sign change in the bracket (e.g. flows
+    that are all negative) return NaN.
+    """
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    times = np.broadcast_to(_flow_times(cash_flows, times, periods_per_year), cash_flows.shape)
+
+    def value_and_slope(rows, rate):
+        discount = np.exp(-times[rows] * np.log1p(rate)[:, None])
+        flows = cash_flows[rows] * discount
+        return flows.sum(axis=1), -(times[rows] * flows).sum(axis=1) / (1 + rate)
+
+    n = len(cash_flows)
+    all_rows = np.arange(n)
+    low, high = np.full(n, -0.99), np.full(n, 10.0)
+    value_low, _ = value_and_slope(all_rows, low)
+    value_high, _ = value_and_slope(all_rows, high)
+    solvable = np.sign(value_low) != np.sign(value_high)
+
+    rate = np.full(n, 0.1)
+    last_step = high - low
+    rows = np.flatnonzero(solvable)
+    for _ in range(max_iter):
+        if len(rows) == 0:
+            break
+        r = rate[rows]
+        value, slope = value_and_slope(rows, r)
+
+        # Move whichever bracket end shares the current NPV's sign
+        same_as_low = np.sign(value) == np.sign(value_low[rows])
+        low[rows] = np.where(same_as_low, r, low[rows])
+        value_low[rows] = np.where(same_as_low, value, value_low[rows])
+        high[rows] = np.where(same_as_low, high[rows], r)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = value / slope
+        newton = r - step
+        bisect = (~np.isfinite(newton) | (newton <= low[rows]) | (newton >= high[rows])
+                  | (np.abs(2 * step) > np.abs(last_step[rows])))
+        new_rate = np.where(bisect, (low[rows] + high[rows]) / 2, newton)
+        new_rate = np.where(value == 0, r, new_rate)
+        last_step[rows] = np.abs(new_rate - r)
+        rate[rows] = new_rate
+
+        converged = (last_step[rows] < tol) | (value == 0) | (high[rows] - low[rows] < tol)
+        rows = rows[~converged]
+
+    return np.where(solvable, rate, np.nan)
+
+def xirr(cash_flows, dates):
+    """IRR for flows on arbitrary dates; `dates` is one row (or one per scenario) of dates"""
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    days = (dates - dates[..., :1]).astype(float)
+    return irr(cash_flows, times=days / 365.0)
@@ -0,0 +1,185 @@
+import sys
+import numpy as np
+import pandas as pd
+from collections import defaultdict
+from pathlib import Path
+from locality_search import normalize
+from price_index import prepare_listings
+
+COORDINATES_PATH = Path(__file__).parent.parent / 'locality_coordinates.csv'
+GEO_INDEX_PATH = Path(__file__).parent.parent / 'geo_index.npz'
+CELL_KM = 1.0
+KM_PER_DEGREE = 111.32
+# Log-spaced price per sq ft bins; a median read from merged histograms is
+# within about 1% of the exact value
+PPSF_BINS = np.geomspace(1000, 100000, 401)
+
+def location_key(name):
+    """Match key that ignores case, punctuation and spacing ("Indiranagar" == "Indira Nagar")"""
+    return normalize(name).replace(' ', '')
+
+def load_coordinates(path=COORDINATES_PATH):
+    """Locality coordinates with `location`, `lat` and `lon` columns"""
+    coordinates = pd.read_csv(path)
+    coordinates['location'] = coordinates['location'].astype(str).str.strip()
+    return coordinates
+
+def build_geo_index(listings, coordinates):
+    """Aggregate listings into a price per sq ft histogram per located locality.
+
+    Listing locations are matched to coordinates with `location_key`;
+    listings in localities without coordinates are dropped.
+    """
+    df = prepare_listings(listings)
+    df['price_per_sqft'] = df['price'] * 100000 / df['total_sqft']
+
+    coordinates = coordinates.assign(key=coordinates['location'].map(location_key))
+    coordinates = coordinates.drop_duplicates('key').reset_index(drop=True)
+    rows = df['location'].map(location_key).map(pd.Series(coordinates.index, index=coordinates['key']))
+    df = df[rows.notna()]
+    rows = rows[rows.notna()].to_numpy(dtype=np.int64)
+
+    n_bins = len(PPSF_BINS) - 1
+    bins = np.clip(np.searchsorted(PPSF_BINS, df['price_per_sqft'].to_numpy(), side='right') - 1, 0, n_bins - 1)
+    histogram = np.bincount(rows * n_bins + bins, minlength=len(coordinates) * n_bins)
+    histogram = histogram.reshape(len(coordinates), n_bins)
+
+    located = histogram.sum(axis=1) > 0
+    medians = df.groupby(rows)['price_per_sqft'].median()
+    return {
+        'location': coordinates['location'].to_numpy(dtype=str)[located],
+        'lat': coordinates['lat'].to_numpy(dtype=np.float64)[located],
+        'lon': coordinates['lon'].to_numpy(dtype=np.float64)[located],
+        'count': histogram.sum(axis=1)[located].astype(np.int32),
+        'median': medians.reindex(np.flatnonzero(located)).to_numpy(dtype=np.float32),
+        'histogram': histogram[located].astype(np.int32),
+    }
+
+def save_geo_index(index, path=GEO_INDEX_PATH):
+    """Store the index as a compressed npz file"""
+    np.savez_compressed(path, **index)
+
+def _histogram_median(histogram):
+    """Median of a binned distribution, interpolated geometrically inside its bin"""
+    cumulative = np.cumsum(histogram)
+    half = cumulative[-1] / 2
+    b = int(np.searchsorted(cumulative, half))
+    below = cumulative[b - 1] if b else 0
+    fraction = (half - below) / histogram[b]
+    low, high = PPSF_BINS[b], PPSF_BINS[b + 1]
+    return float(low * (high / low) ** fraction)
+
+class GeoIndex:
+    """Grid-hashed locality index for radius price queries.
+
+    Coordinates are projected to kilometres around the index's mean latitude
+    and bucketed into square cells. Each cell keeps the merged histogram of
+    its localities, so cells lying wholly inside a query circle are added in
+    one step; only cells on the circle's edge look at individual localities.
+    Query cost depends on the number of nearby cells, not on listing volume.
+    """
+
+    def __init__(self, index, cell_km=CELL_KM):
+        self.locations = index['location']
+        self.count = index['count']
+        self.median = index['median']
+        self.histogram = index['histogram']
+        self.cell_km = cell_km
+        self._scale = np.cos(np.radians(np.mean(index['lat']))) * KM_PER_DEGREE
+        self.x, self.y = self._project(index['lat'], index['lon'])
+        self._coords = {
+            location_key(name): (float(lat), float(lon))
+            for name, lat, lon in zip(self.locations, index['lat'], index['lon'])
+        }
+
+        members = defaultdict(list)
+        for row, cell in enumerate(zip(*self._cell(self.x, self.y))):
+            members[cell].append(row)
+        self._cells = {cell: np.array(rows) for cell, rows in members.items()}
+        self._cell_histograms = {cell: self.histogram[rows].sum(axis=0) for cell, rows in self._cells.items()}
+
+    def __len__(self):
+        return len(self.locations)
+
+    def _project(self, lat, lon):
+        return np.asarray(lon) * self._scale, np.asarray(lat) * KM_PER_DEGREE
+
+    def _cell(self, x, y):
+        return (np.floor(np.asarray(x) / self.cell_km).astype(int),
+                np.floor(np.asarray(y) / self.cell_km).astype(int))
+
+    def locate(self, location):
+        """(lat, lon) of an indexed locality, or None"""
+        return self._coords.get(location_key(location))
+
+    def _within(self, lat, lon, radius_km):
+        """Yield (cell, rows, distances) for the occupied cells overlapping a circle.
+
+        `distances` is None when the whole cell lies inside the circle;
+        otherwise only the member rows inside it are yielded.
+        """
+        x, y = self._project(lat, lon)
+        (x0, y0), (x1, y1) = (self._cell(x - radius_km, y - radius_km),
+                              self._cell(x + radius_km, y + radius_km))
+        # Walk the bounding box of cells, or the occupied cells if fewer
+        if (x1 - x0 + 1) * (y1 - y0 + 1) <= len(self._cells):
+            cells = ((cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1))
+        else:
+            cells = (cell for cell in self._cells if x0 <= cell[0] <= x1 and y0 <= cell[1] <= y1)
+        for cell in cells:
+            rows = self._cells.get(cell)
+            if rows is None:
+                continue
+            cx, cy = cell
+            # Farthest cell corner inside the circle means every member is too
+            dx = max(abs(cx * self.cell_km - x), abs((cx + 1) * self.cell_km - x))
+            dy = max(abs(cy * self.cell_km - y), abs((cy + 1) * self.cell_km - y))
+            if dx * dx + dy * dy <= radius_km * radius_km:
+                yield cell, rows, None
+            else:
+                distances = np.hypot(self.x[rows] - x, self.y[rows] - y)
+                yield cell, rows[distances <= radius_km], distances[distances <= radius_km]
+
+    def median_within(self, lat, lon, radius_km):
+        """Median price per sq ft and listing count within a radius, or None"""
+        total = np.zeros(self.histogram.shape[1], dtype=np.int64)
+        for cell, rows, distances in self._within(lat, lon, radius_km):
+            if distances is None:
+                total += self._cell_histograms[cell]
+            elif len(rows):
+                total += self.histogram[rows].sum(axis=0)
+        if not total.any():
+            return None
+        return _histogram_median(total), int(total.sum())
+
+    def cheapest_near(self, lat, lon, radius_km, limit=10):
+        """Localities within a radius, cheapest median price per sq ft first"""
+        x, y = self._project(lat, lon)
+        rows = [rows for _, rows, _ in self._within(lat, lon, radius_km)]
+        rows = np.concatenate(rows) if rows else np.array([], dtype=int)
+
+        result = pd.DataFrame({
+            'location': self.locations[rows],
+            'distance_km': np.hypot(self.x[rows] - x, self.y[rows] - y),
+            'median_price_per_sqft': self.median[rows],
+            'listings': self.count[rows],
+        })
+        return result.sort_values(['median_price_per_sqft', 'distance_km']).head(limit).reset_index(drop=True)
+
+def load_geo_index(path=GEO_INDEX_PATH):
+    """Load a saved geo index, or None if it hasn't been built yet"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with np.load(path) as data:
+        return GeoIndex({key: data[key] for key in data.files})
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python geo_index.py <listings.csv> [output.npz]")
+        sys.exit(1)
+
+    output = sys.argv[2] if len(sys.argv) > 2 else GEO_INDEX_PATH
+    index = build_geo_index(pd.read_csv(sys.argv[1]), load_coordinates())
+    save_geo_index(index, output)
+    print(f"Located {len(index['location'])} localities ({index['count'].sum()} listings) to {output}")
@@ -1,8 +1,10 @@
-import pickle
 import numpy as np
-from pathlib import Path
 import tkinter as tk
 from tkinter import ttk, messagebox
+from model_registry import get_registry
+from price_model import prediction_interval
+from locality_search import model_locations, search_index
+from prediction_log import log_prediction
 
 class BangaloreHousePricePredictor:
     def __init__(self, root):
@@ -55,12 +57,16 @@ class BangaloreHousePricePredictor:
         location_label = ttk.Label(input_frame, text="📍 Location:", style='Input.TLabel')
         location_label.grid(row=3, column=0, padx=5, pady=15, sticky=tk.W)
         
+        # Load model (the location list comes from it)
+        self.load_model()
+        
         self.location_var = tk.StringVar()
-        locations = sorted(self.get_location_map().values())
-        location_dropdown = ttk.Combobox(input_frame, textvariable=self.location_var,
-                                       values=locations, width=30, style='Combo.TCombobox',
-                                       state='readonly')
-        location_dropdown.grid(row=3, column=1, padx=5, pady=15, sticky=tk.W)
+        self.locations = sorted(self.get_location_map().values())
+        self.location_search = search_index(tuple(self.locations))
+        self.location_dropdown = ttk.Combobox(input_frame, textvariable=self.location_var,
+                                            values=self.locations, width=30, style='Combo.TCombobox')
+        self.location_dropdown.grid(row=3, column=1, padx=5, pady=15, sticky=tk.W)
+        self.location_dropdown.bind('<KeyRelease>', self.filter_locations)
         
         # Predict button
         predict_btn = ttk.Button(main_frame, text="Calculate Price 🔍",
@@ -76,9 +82,6 @@ class BangaloreHousePricePredictor:
         result_label = ttk.Label(result_frame, textvariable=self.result_var,
                                style='Result.TLabel')
         result_label.pack(expand=True)
-        
-        # Load model
-        self.load_model()
 
     def configure_styles(self):
         style = ttk.Style()
@@ -150,26 +153,26 @@ class BangaloreHousePricePredictor:
 
     def load_model(self):
         """Load the pre-trained model"""
+        self.model = None
         try:
-            model_path = Path(__file__).parent.parent / 'banglore_home_prices_model.pickle'
-            with open(model_path, 'rb') as f:
-                self.model = pickle.load(f)
+            self.model = get_registry()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load model: {str(e)}")
             self.root.quit()
 
     def get_location_map(self):
-        """Map location indices to readable names"""
-        return {
-            0: "Whitefield", 10: "HSR Layout", 20: "Electronic City", 
-            30: "Marathahalli", 40: "Koramangala", 50: "Indiranagar", 
-            60: "JP Nagar", 70: "Bannerghatta Road", 80: "Sarjapur Road", 
-            90: "Hebbal", 100: "Banashankari", 110: "BTM Layout", 
-            120: "Jayanagar", 130: "Bellandur", 140: "CV Raman Nagar",
-            150: "Malleswaram", 160: "Old Airport Road", 170: "Rajaji Nagar", 
-            180: "Yelahanka", 190: "KR Puram", 200: "Mahadevapura", 
-            210: "Thanisandra", 220: "Kengeri", 230: "Hoodi"
-        }
+        """Map location indices to the model's locality names"""
+        if self.model is None:
+            return {}
+        return dict(enumerate(model_locations(self.model.production)))
+
+    def filter_locations(self, event):
+        """Narrow the dropdown to localities matching what has been typed"""
+        if event.keysym in ('Up', 'Down', 'Return', 'Escape', 'Tab'):
+            return
+        query = self.location_var.get()
+        matches = self.location_search.search(query, limit=50) if query else self.locations
+        self.location_dropdown['values'] = matches or self.locations
 
     def format_price(self, price):
         """Format price in lakhs with Indian number system"""
@@ -213,12 +216,20 @@ class BangaloreHousePricePredictor:
                 messagebox.showerror("Error", "Please select a location")
                 return
             
+            if location not in self.locations:
+                suggestion = self.location_search.best_match(location)
+                if suggestion is None:
+                    messagebox.showerror("Error", f"Unknown location: {location}")
+                    return
+                location = suggestion
+                self.location_var.set(location)
+            
             if area <= 0 or bhk <= 0 or bath <= 0:
                 messagebox.showerror("Error", "Please enter positive values")
                 return
             
             # Prepare input features
-            x = np.zeros(244)  # Model expects 244 features
+            x = np.zeros(self.model.production.n_features_in_)  # 244 features for the base model
             
             # Set basic features
             x[0] = area
@@ -234,7 +245,13 @@ class BangaloreHousePricePredictor:
             predicted_price = self.model.predict([x])[0]
             
             # Display result
-            self.result_var.set(f"Estimated Price: {self.format_price(predicted_price)}")
+            result = f"Estimated Price: {self.format_price(predicted_price)}"
+            interval = prediction_interval(self.model.production, x)
+            if interval is not None:
+                low, high = interval
+                result += f"\n95% range: {self.format_price(max(low, 0))} – {self.format_price(high)}"
+            self.result_var.set(result)
+            log_prediction('tk', self.model, location, area, bhk, bath, predicted_price, interval)
             
         except Exception as e:
             messagebox.showerror("Error", str(e))
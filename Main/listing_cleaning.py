@@ -0,0 +1,112 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from price_index import prepare_listings
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pandas writes the CSV instead, several times slower
+    pa = pa_csv = None
+
+MIN_SQFT_PER_BHK = 300
+MAX_EXTRA_BATHS = 2  # more than bhk + 2 bathrooms is treated as a data error
+OUTLIER_STDS = 1.0  # keep listings within this many std devs of their location's mean price/sq ft
+
+def apply_rules(df):
+    """Drop listings with too little area per bedroom or too many bathrooms"""
+    keep = df['total_sqft'] / df['bhk'] >= MIN_SQFT_PER_BHK
+    if 'bath' in df.columns:
+        keep &= ~(df['bath'] > df['bhk'] + MAX_EXTRA_BATHS)
+    return df[keep]
+
+def _prepared(chunk):
+    df = apply_rules(prepare_listings(chunk))
+    return df.assign(price_per_sqft=df['price'] * 100000 / df['total_sqft'])
+
+def location_moments(df):
+    """Per-location count, sum and sum of squares of price/sq ft; add chunks' moments to combine them"""
+    grouped = df['price_per_sqft'].groupby(df['location'])
+    return pd.DataFrame({
+        'count': grouped.count(),
+        'sum': grouped.sum(),
+        'sumsq': (df['price_per_sqft'] ** 2).groupby(df['location']).sum(),
+    })
+
+def combine_moments(moments):
+    """Sum per-chunk moments into one table"""
+    moments = [m for m in moments if len(m)]
+    if not moments:
+        return pd.DataFrame(columns=['count', 'sum', 'sumsq'])
+    return pd.concat(moments).groupby(level=0).sum()
+
+def remove_price_outliers(df, moments=None):
+    """Drop listings far from their location's mean price per sq ft.
+
+    Without `moments` the per-location mean and std come from grouped
+    transforms over `df` itself; with moments (from `location_moments`
+    over a whole dataset) they are mapped onto the rows, so a chunk is
+    judged against its location's full distribution. Locations with a
+    single listing are kept as they are.
+    """
+    ppsf = df['price_per_sqft']
+    if moments is None:
+        grouped = ppsf.groupby(df['location'])
+        mean, std = grouped.transform('mean'), grouped.transform('std')
+    else:
+        count = df['location'].map(moments['count'])
+        mean = df['location'].map(moments['sum']) / count
+        variance = (df['location'].map(moments['sumsq']) - count * mean ** 2) / (count - 1)
+        std = np.sqrt(variance.clip(lower=0))
+    keep = std.isna() | ((ppsf - mean).abs() <= OUTLIER_STDS * std)
+    return df[keep]
+
+def clean_listings(listings, moments=None):
+    """Parse, apply the sanity rules and remove per-location price outliers"""
+    return remove_price_outliers(_prepared(listings), moments)
+
+def dataset_moments(paths, chunksize=1000000):
+    """First pass over CSV files: location moments of the rule-filtered listings"""
+    return combine_moments(
+        location_moments(_prepared(chunk))
+        for path in paths for chunk in pd.read_csv(path, chunksize=chunksize)
+    )
+
+def clean_csv(paths, output, chunksize=1000000):
+    """Clean CSV files in two chunked passes and write one cleaned CSV.
+
+    The first pass collects per-location moments over everything; the
+    second filters each chunk against them. Returns (rows read, rows kept).
+    """
+    moments = dataset_moments(paths, chunksize)
+    read = kept = 0
+    with open(output, 'wb') as f:
+        for path in paths:
+            for chunk in pd.read_csv(path, chunksize=chunksize):
+                cleaned = clean_listings(chunk, moments)
+                _write_csv_chunk(cleaned, f, header=read == 0)
+                read += len(chunk)
+                kept += len(cleaned)
+    return read, kept
+
+def _write_csv_chunk(df, f, header):
+    if pa_csv is not None:
+        options = pa_csv.WriteOptions(include_header=header)
+        pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), f, write_options=options)
+    else:
+        f.write(df.to_csv(header=header, index=False).encode())
+
+def main():
+    parser = argparse.ArgumentParser(description="Clean raw listing dumps for indexing and retraining")
+    parser.add_argument('data', nargs='+', help="Raw listing CSV files")
+    parser.add_argument('--output', required=True, help="Cleaned CSV to write")
+    parser.add_argument('--chunksize', type=int, default=1000000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    read, kept = clean_csv(args.data, args.output, args.chunksize)
+    print(f"Kept {kept} of {read} listings in {time.perf_counter() - start:.1f}s, wrote {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import argparse
+import random
+import resource
+import sys
+import time
+import numpy as np
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from streamlit.testing.v1 import AppTest
+
+APP_DIR = Path(__file__).parent
+TIMEOUT = 60
+
+def _home(at, rng):
+    at.run()
+
+def _price_prediction(at, rng):
+    at.number_input[0].set_value(float(rng.randrange(600, 3000, 50)))
+    at.run()
+    at.button[0].click()
+    at.run()
+
+def _market_analytics(at, rng):
+    at.sidebar.slider[0].set_value((float(rng.randrange(700, 1000)), float(rng.randrange(1500, 2500))))
+    at.run()
+
+def _emi_calculator(at, rng):
+    at.number_input[1].set_value(round(rng.uniform(7.0, 11.0), 1))
+    at.button[0].click()
+    at.run()
+
+def _investment_analysis(at, rng):
+    at.number_input[2].set_value(rng.randrange(10000, 60000, 1000))
+    at.button[0].click()
+    at.run()
+
+# Page script and the widget interaction replayed against it on each iteration
+SCENARIOS = {
+    'Home': ('Home.py', _home),
+    'Price Prediction': ('pages/Price_Prediction.py', _price_prediction),
+    'Market Analytics': ('pages/Market_Analytics.py', _market_analytics),
+    'EMI Calculator': ('pages/EMI_Calculator.py', _emi_calculator),
+    'Investment Analysis': ('pages/Investment_Analysis.py', _investment_analysis),
+}
+
+def _rss_bytes():
+    """Resident memory of this process; peak RSS where /proc isn't available"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+def _visit(page, at, rng, timings):
+    script, interact = SCENARIOS[page]
+    if at is None:
+        # First visit is a full script run, like opening the page
+        at = AppTest.from_file(str(APP_DIR / script), default_timeout=TIMEOUT)
+        start = time.perf_counter()
+        at.run()
+        timings.append((page, time.perf_counter() - start))
+
+    start = time.perf_counter()
+    interact(at, rng)
+    timings.append((page, time.perf_counter() - start))
+    if at.exception:
+        raise RuntimeError(f"{page} raised: {at.exception[0].value}")
+    return at
+
+_warmup = None
+
+def _warm_worker(pages):
+    """Visit every page once in a fresh worker and return (seconds, RSS growth).
+
+    The first session in a process pays for imports, model loading and the
+    caches, which the sessions after it share; that cost is measured here
+    once per worker instead of being charged to whichever session ran first.
+    Returns None if this worker has already warmed up.
+    """
+    global _warmup
+    if _warmup is not None:
+        return None
+    before = _rss_bytes()
+    start = time.perf_counter()
+    rng = random.Random(-1)
+    for page in pages:
+        _visit(page, None, rng, [])
+    _warmup = (time.perf_counter() - start, _rss_bytes() - before)
+    return _warmup
+
+def run_session(session_id, iterations, pages):
+    """Drive one simulated user through the pages.
+
+    Returns [(page, seconds)] per rerun, the RSS the session added and the
+    worker's warm-up cost if this session triggered it. Memory is read from
+    RSS rather than tracemalloc so the timed reruns run untraced.
+    """
+    warmup = _warm_worker(pages)
+    baseline = _rss_bytes()
+    rng = random.Random(session_id)
+    timings = []
+    apps = {}
+    for _ in range(iterations):
+        page = rng.choice(pages)
+        apps[page] = _visit(page, apps.get(page), rng, timings)
+    return timings, _rss_bytes() - baseline, warmup
+
+def summarize(latencies):
+    values = np.array(latencies) * 1000
+    return {
+        'count': len(values),
+        'p50': np.percentile(values, 50),
+        'p95': np.percentile(values, 95),
+        'p99': np.percentile(values, 99),
+    }
+
+def run_load_test(sessions=10, iterations=20, concurrency=4, pages=None):
+    """Run simulated sessions concurrently and collect latency and memory stats.
+
+    AppTest patches process-wide Streamlit state while a script runs, so
+    concurrent sessions run in separate worker processes, each working
+    through its share of sessions one after another.
+    """
+    pages = list(pages or SCENARIOS)
+    # AppTest swaps sys.modules['__main__'] for the page script it runs, so
+    # hand the workers the function by its importable name, not __main__'s
+    from load_test import run_session
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(run_session, range(sessions), [iterations] * sessions, [pages] * sessions))
+    elapsed = time.perf_counter() - start
+
+    by_page = defaultdict(list)
+    for timings, _, _ in results:
+        for page, seconds in timings:
+            by_page[page].append(seconds)
+    all_latencies = [seconds for values in by_page.values() for seconds in values]
+    memory = np.array([growth for _, growth, _ in results]) / 2**20
+    warmups = np.array([warmup for _, _, warmup in results if warmup is not None])
+
+    return {
+        'sessions': sessions,
+        'elapsed': elapsed,
+        'reruns_per_sec': len(all_latencies) / elapsed,
+        'overall': summarize(all_latencies),
+        'pages': {page: summarize(values) for page, values in sorted(by_page.items())},
+        'memory_per_session_mb': memory.mean(),
+        'max_memory_per_session_mb': memory.max(),
+        'workers': len(warmups),
+        'warmup_seconds': warmups[:, 0].mean(),
+        'warmup_memory_mb': warmups[:, 1].mean() / 2**20,
+    }
+
+def print_report(report):
+    print(f"{report['sessions']} sessions in {report['elapsed']:.1f}s, "
+          f"{report['reruns_per_sec']:.1f} reruns/sec")
+    print(f"{'Page':<22}{'reruns':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    rows = list(report['pages'].items()) + [('All pages', report['overall'])]
+    for page, stats in rows:
+        print(f"{page:<22}{stats['count']:>8}{stats['p50']:>10.1f}{stats['p95']:>10.1f}{stats['p99']:>10.1f}")
+    print(f"Memory growth per session: {report['memory_per_session_mb']:.2f} MB mean, "
+          f"{report['max_memory_per_session_mb']:.2f} MB max")
+    print(f"Worker warm-up (not counted above): {report['warmup_seconds']:.1f}s and "
+          f"{report['warmup_memory_mb']:.1f} MB per worker, {report['workers']} workers")
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless multi-session load test for the Streamlit app")
+    parser.add_argument('--sessions', type=int, default=10, help="Simulated user sessions")
+    parser.add_argument('--iterations', type=int, default=20, help="Interactions per session")
+    parser.add_argument('--concurrency', type=int, default=4, help="Worker processes running sessions at once")
+    parser.add_argument('--pages', nargs='+', choices=list(SCENARIOS), help="Restrict to these pages")
+    args = parser.parse_args()
+
+    print_report(run_load_test(args.sessions, args.iterations, args.concurrency, args.pages))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import re
+from collections import defaultdict
+from functools import lru_cache
+from property_features import base_width
+
+# Well-known localities shown by default where a short list is needed
+POPULAR_LOCATIONS = [
+    "Whitefield", "HSR Layout", "Electronic City", "Marathahalli", "Koramangala",
+    "Indiranagar", "JP Nagar", "Bannerghatta Road", "Sarjapur Road", "Hebbal",
+    "Banashankari", "BTM Layout", "Jayanagar", "Bellandur", "CV Raman Nagar",
+    "Malleswaram", "Old Airport Road", "Rajaji Nagar", "Yelahanka", "KR Puram",
+    "Mahadevapura", "Thanisandra", "Kengeri", "Hoodi"
+]
+
+def model_locations(model):
+    """Location names in model column order (column = 3 + position)"""
+    return [str(name) for name in model.feature_names_in_[3:base_width(model)]]
+
+def normalize(text):
+    """Lowercase, drop punctuation and collapse whitespace"""
+    return ' '.join(re.sub(r'[^0-9a-z ]', ' ', text.lower()).split())
+
+def _trigrams(text):
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class LocalitySearch:
+    """Prefix trie plus trigram index for typo-tolerant locality autocomplete.
+
+    The trie holds each name from the start of every word, so "nagar" finds
+    "JP Nagar". When prefixes run out, names sharing the most trigrams with
+    the query fill the remaining slots ("indiranagar" -> "Indira Nagar").
+    """
+
+    def __init__(self, names, min_similarity=0.3):
+        self.names = list(names)
+        self.min_similarity = min_similarity
+        self._keys = [normalize(name) for name in self.names]
+        self._trie = {}
+        self._grams = defaultdict(list)
+        self._gram_counts = []
+
+        for name_id, key in enumerate(self._keys):
+            starts = [0] + [m.end() for m in re.finditer(' ', key)]
+            for start in starts:
+                node = self._trie
+                for char in key[start:]:
+                    node = node.setdefault(char, {})
+                node.setdefault(None, []).append(name_id)
+
+            grams = _trigrams(key)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._grams[gram].append(name_id)
+
+    def _prefix_ids(self, query):
+        """Every name with a word starting with the query"""
+        node = self._trie
+        for char in query:
+            node = node.get(char)
+            if node is None:
+                return set()
+
+        found = set()
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            found.update(node.get(None, ()))
+            stack.extend(child for char, child in node.items() if char is not None)
+        return found
+
+    def _fuzzy_ids(self, query, limit, exclude):
+        grams = _trigrams(query)
+        shared = defaultdict(int)
+        for gram in grams:
+            for name_id in self._grams.get(gram, ()):
+                shared[name_id] += 1
+
+        scored = []
+        for name_id, count in shared.items():
+            if name_id in exclude:
+                continue
+            score = 2 * count / (len(grams) + self._gram_counts[name_id])
+            if score >= self.min_similarity:
+                scored.append((-score, self.names[name_id], name_id))
+        return [name_id for _, _, name_id in sorted(scored)[:limit]]
+
+    def search(self, query, limit=10):
+        """Best matching names for a partial or misspelt query"""
+        query = normalize(query)
+        if not query:
+            return sorted(self.names)[:limit]
+
+        # Rank every prefix match before cutting to the limit: an exact name
+        # first, then names starting with the query, then mid-name word matches
+        ids = sorted(self._prefix_ids(query), key=lambda name_id: (
+            self._keys[name_id] != query,
+            not self._keys[name_id].startswith(query),
+            self._keys[name_id],
+            name_id,
+        ))[:limit]
+        if len(ids) < limit:
+            ids += self._fuzzy_ids(query, limit - len(ids), set(ids))
+        return [self.names[name_id] for name_id in ids]
+
+    def best_match(self, query):
+        """Single closest name, or None"""
+        matches = self.search(query, limit=1)
+        return matches[0] if matches else None
+
+@lru_cache(maxsize=4)
+def search_index(names):
+    """Shared search index for a tuple of names"""
+    return LocalitySearch(names)
+
+def popular_locations(names):
+    """The popular localities as spelt in a vocabulary"""
+    index = search_index(tuple(names))
+    matches = (index.best_match(name) for name in POPULAR_LOCATIONS)
+    return list(dict.fromkeys(match for match in matches if match))
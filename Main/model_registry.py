@@ -0,0 +1,168 @@
+import csv
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from prediction_log import LOG_DIR
+from price_model import sparse_predict
+from shared_tables import attach_model, is_shared_tables
+
+CONFIG_PATH = Path(__file__).parent.parent / 'models.json'
+DEFAULT_CONFIG = {'production': 'banglore_home_prices_model.pickle', 'candidate': None}
+MAX_PENDING_SHADOWS = 100
+SHADOW_LOG_DIR = Path(os.environ.get('PRICEGENIE_SHADOW_LOG', LOG_DIR))
+SHADOW_COLUMNS = ('timestamp', 'production', 'candidate', 'rows', 'max_abs_delta', 'mean_delta',
+                  'production_ms', 'candidate_ms')
+
+logger = logging.getLogger('pricegenie.models')
+
+def load_config(path=CONFIG_PATH):
+    """Read the model config; model paths are relative to the config file"""
+    path = Path(path)
+    config = dict(DEFAULT_CONFIG)
+    if path.exists():
+        with open(path) as f:
+            config.update(json.load(f))
+    for role in ('production', 'candidate'):
+        if config[role]:
+            config[role] = path.parent / config[role]
+    return config
+
+def load_artifact(path):
+    """Load a model pickle, or attach to a published shared-tables directory"""
+    if is_shared_tables(path):
+        return attach_model(path)
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+class ModelRegistry:
+    """Production model plus an optional candidate scored in the shadow.
+
+    `predict` returns the production prediction straight away. When a
+    candidate is configured the same input is scored by it on a background
+    thread and the delta and per-model latency are appended to the shadow
+    log (see `record_shadow`); shadow work is dropped rather than queued
+    when the candidate falls behind.
+    """
+
+    def __init__(self, config):
+        self.production = load_artifact(config['production'])
+        self.production_path = config['production']
+        self.candidate = None
+        self.candidate_path = config['candidate']
+        if config['candidate']:
+            # A bad candidate only costs the shadow comparison, never production
+            try:
+                self.candidate = load_artifact(config['candidate'])
+            except Exception:
+                logger.exception("Candidate %s failed to load; serving without shadow scoring",
+                                 config['candidate'])
+        self._shadow_pool = None
+        self._shadow_slots = threading.BoundedSemaphore(MAX_PENDING_SHADOWS)
+        if self.candidate is not None:
+            self._shadow_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='shadow')
+
+    def predict(self, X):
+        """Predict with the production model, shadowing the candidate if any"""
+        return self._score(lambda model: model.predict(X))
+
+    def predict_sparse(self, indices, values):
+        """Score one sparse feature vector, shadowing the candidate if any"""
+        return self._score(lambda model: sparse_predict(model, indices, values))
+
+    def _score(self, score):
+        start = time.perf_counter()
+        predictions = score(self.production)
+        latency = time.perf_counter() - start
+
+        if self._shadow_pool is not None and self._shadow_slots.acquire(blocking=False):
+            try:
+                self._shadow_pool.submit(self._shadow, score, predictions, latency)
+            except RuntimeError:  # closed by a reload while this request was in flight
+                self._shadow_slots.release()
+        return predictions
+
+    def _shadow(self, score, production_predictions, production_latency):
+        try:
+            start = time.perf_counter()
+            candidate_predictions = score(self.candidate)
+            candidate_latency = time.perf_counter() - start
+            delta = np.atleast_1d(candidate_predictions - production_predictions)
+            record_shadow(
+                Path(self.production_path).name, Path(self.candidate_path).name, len(delta),
+                np.abs(delta).max(), delta.mean(), production_latency * 1000, candidate_latency * 1000
+            )
+        except Exception:
+            logger.exception("Shadow scoring failed for candidate %s", self.candidate_path)
+        finally:
+            self._shadow_slots.release()
+
+    def close(self):
+        """Stop the shadow thread once queued shadow work is done"""
+        if self._shadow_pool is not None:
+            self._shadow_pool.shutdown(wait=False)
+
+_shadow_log = None
+_shadow_lock = threading.Lock()
+
+def record_shadow(production, candidate, rows, max_abs_delta, mean_delta, production_ms, candidate_ms):
+    """Append one shadow comparison to this process's shadow log.
+
+    Each process writes its own `shadow-<start>-<pid>.csv` next to the
+    prediction log, line-buffered so rows survive a crash.
+    """
+    global _shadow_log
+    with _shadow_lock:
+        if _shadow_log is None or _shadow_log[0] != os.getpid():
+            SHADOW_LOG_DIR.mkdir(parents=True, exist_ok=True)
+            path = SHADOW_LOG_DIR / f"shadow-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.csv"
+            f = open(path, 'a', newline='', buffering=1)
+            writer = csv.writer(f)
+            writer.writerow(SHADOW_COLUMNS)
+            _shadow_log = (os.getpid(), writer)
+        _shadow_log[1].writerow([
+            time.strftime('%Y-%m-%d %H:%M:%S'), production, candidate, rows,
+            f'{max_abs_delta:.6g}', f'{mean_delta:.6g}', f'{production_ms:.3f}', f'{candidate_ms:.3f}'
+        ])
+
+def read_shadow_log(path=SHADOW_LOG_DIR):
+    """All shadow comparisons logged so far, from every process"""
+    frames = [pd.read_csv(file) for file in sorted(Path(path).glob('shadow-*.csv'))]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=SHADOW_COLUMNS)
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+def get_registry(config_path=CONFIG_PATH):
+    """Process-wide registry, reloaded when the config file changes.
+
+    Promoting a candidate is a matter of editing `models.json`; running
+    processes pick the new models up on their next request.
+    """
+    config_path = Path(config_path)
+    mtime = config_path.stat().st_mtime if config_path.exists() else None
+    with _registries_lock:
+        cached = _registries.get(config_path)
+        if cached is None or cached[0] != mtime:
+            _registries[config_path] = (mtime, ModelRegistry(load_config(config_path)))
+            if cached is not None:
+                cached[1].close()  # otherwise its shadow thread outlives it
+        return _registries[config_path][1]
+
+def reload_registry(config_path=CONFIG_PATH):
+    """Drop cached registries and load the models afresh.
+
+    Needed when a model file is replaced in place without touching the
+    config, e.g. a new pickle or republished shared tables.
+    """
+    with _registries_lock:
+        cached = _registries.pop(Path(config_path), None)
+    if cached is not None:
+        cached[1].close()
+    return get_registry(config_path)
@@ -0,0 +1,81 @@
+import itertools
+import os
+import time
+import pandas as pd
+import streamlit as st
+from pathlib import Path
+
+PROFILE_ENV = 'PRICEGENIE_PROFILE'
+PROFILE_DIR = Path(os.environ.get('PRICEGENIE_PROFILE_DIR', Path(__file__).parent.parent / 'profiles'))
+TOP_FUNCTIONS = 15
+HISTORY = 50
+
+_saved = itertools.count(1)
+
+def profiling_enabled():
+    """Developer mode: PRICEGENIE_PROFILE=1 for every session, or ?profile=1 for one"""
+    return bool(os.environ.get(PROFILE_ENV)) or st.query_params.get('profile') in ('1', 'true')
+
+def run_page(page, name):
+    """Run a page's entry point, under cProfile when developer mode is on.
+
+    When it's off the page is simply called, so normal sessions pay nothing.
+    Only the script thread is profiled; work handed to background threads
+    shows up as the time spent waiting for it, if any.
+    """
+    if not profiling_enabled():
+        return page()
+
+    import cProfile
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    try:
+        profiler.runcall(page)
+    finally:
+        seconds = time.perf_counter() - start
+        history = st.session_state.setdefault('profile_history', {}).setdefault(name, [])
+        history.append(seconds)
+        del history[:-HISTORY]
+    # Not reached on st.rerun()/st.stop(), whose reruns get their own panel
+    show_profile(name, profiler, history)
+
+def top_functions(profiler, limit=TOP_FUNCTIONS):
+    """Functions with the most cumulative time in a profile"""
+    import pstats
+    rows = [
+        {
+            'function': f"{func} ({Path(file).name}:{line})" if line else func,
+            'calls': calls,
+            'own_s': own,
+            'cumulative_s': cumulative,
+        }
+        for (file, line, func), (_, calls, own, cumulative, _) in pstats.Stats(profiler).stats.items()
+    ]
+    return pd.DataFrame(rows).sort_values('cumulative_s', ascending=False).head(limit).reset_index(drop=True)
+
+def save_profile(profiler, name):
+    """Write a profile for offline analysis (pstats, snakeviz) and return its path"""
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    path = PROFILE_DIR / f"{name.lower().replace(' ', '_')}-{stamp}-{os.getpid()}-{next(_saved):04d}.prof"
+    profiler.dump_stats(path)
+    return path
+
+def show_profile(name, profiler, history):
+    """Sidebar panel with this rerun's hotspots and the time per rerun so far"""
+    with st.sidebar.expander("⏱️ Profiler", expanded=True):
+        previous = history[-2] if len(history) > 1 else None
+        st.metric(
+            f"{name} rerun", f"{history[-1] * 1000:.0f} ms",
+            None if previous is None else f"{(history[-1] - previous) * 1000:+.0f} ms",
+            delta_color="inverse"
+        )
+        if len(history) > 1:
+            st.line_chart(pd.DataFrame({'ms': [s * 1000 for s in history]}), height=120)
+        st.dataframe(
+            top_functions(profiler).round(4),
+            hide_index=True,
+            use_container_width=True
+        )
+        if st.checkbox("Save each rerun's profile", key='profile_save'):
+            st.caption(f"Saved `{save_profile(profiler, name)}`")
@@ -1,16 +1,19 @@
 import streamlit as st
 import numpy as np
+import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import finance
+from affordability import CONFIGURATIONS, feasible_homes, max_property_price
+from locality_search import model_locations
+from model_registry import get_registry
+from page_profiler import run_page
+
+TENURES = np.arange(5, 31, 5)
 
 def calculate_emi(principal, rate, tenure):
     """Calculate EMI for given principal, interest rate and tenure"""
-    rate = rate / (12 * 100)  # monthly interest rate
-    tenure_months = tenure * 12  # tenure in months
-    
-    # EMI formula
-    emi = principal * rate * (1 + rate)**tenure_months / ((1 + rate)**tenure_months - 1)
-    return emi
+    return float(finance.emi(principal, rate, tenure))
 
 def format_currency(amount):
     """Format amount in Indian currency format"""
@@ -26,9 +29,134 @@ def format_currency(amount):
         formatted = s
     return f"₹{formatted}"
 
-def app():
-    st.title("💰 Home Loan EMI Calculator")
+@st.cache_data(max_entries=100)
+def breakdown_figure(actual_loan, total_interest):
+    """Pie chart of principal vs interest"""
+    fig_pie = go.Figure(data=[
+        go.Pie(
+            labels=['Principal', 'Interest'],
+            values=[actual_loan, total_interest],
+            hole=0.5,
+            marker_colors=['#1E88E5', '#FFC107']
+        )
+    ])
+    
+    fig_pie.update_layout(
+        title="Principal vs Interest Distribution",
+        showlegend=True
+    )
+    return fig_pie
+
+@st.cache_data(max_entries=100)
+def balance_figure(actual_loan, interest_rate, loan_tenure, monthly_emi):
+    """Outstanding balance at the end of each year"""
+    # Calculate year-wise data
+    years = np.arange(1, loan_tenure + 1)
+    yearly_payment = monthly_emi * 12
+    balance = np.zeros(loan_tenure)
+    
+    remaining_balance = actual_loan
+    for i in range(loan_tenure):
+        interest_yearly = remaining_balance * (interest_rate / 100)
+        principal_yearly = yearly_payment - interest_yearly
+        remaining_balance -= principal_yearly
+        balance[i] = remaining_balance
+    
+    # Create amortization schedule chart
+    fig_schedule = go.Figure()
+    
+    fig_schedule.add_trace(go.Scatter(
+        x=years,
+        y=balance,
+        name='Outstanding Balance',
+        line=dict(color='#1E88E5')
+    ))
+    
+    fig_schedule.update_layout(
+        title='Outstanding Loan Balance Over Time',
+        xaxis_title='Year',
+        yaxis_title='Outstanding Balance (₹)',
+        showlegend=True
+    )
+    return fig_schedule
+
+@st.fragment
+def show_affordability():
+    """Work back from income to the loan, price and homes within reach"""
+    with st.form("affordability"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            monthly_income = st.number_input(
+                "Monthly Income (₹)", min_value=10000, max_value=10000000, value=150000, step=5000
+            )
+            existing_emi = st.number_input(
+                "Existing EMIs (₹/month)", min_value=0, max_value=5000000, value=0, step=1000
+            )
+        with col2:
+            foir = st.slider(
+                "FOIR Limit (%)", min_value=20, max_value=70, value=50,
+                help="Share of income lenders allow for all EMIs (fixed obligations to income ratio)"
+            )
+            rate = st.number_input("Interest Rate (%)", min_value=5.0, max_value=20.0, value=8.5, step=0.1,
+                                   key="afford_rate")
+        with col3:
+            down_payment = st.number_input("Down Payment (%)", min_value=0, max_value=90, value=20, step=5,
+                                           key="afford_down_payment")
+            tenure = st.selectbox("Loan Tenure (Years)", TENURES.tolist(), index=3)
+        submitted = st.form_submit_button("Find Affordable Homes", use_container_width=True)
+    
+    if not submitted:
+        return
     
+    # All tenures at once, so the table shows what a longer loan buys
+    loans, prices = max_property_price(monthly_income, foir, rate, TENURES, down_payment, existing_emi)
+    if prices.max() <= 0:
+        st.warning("Existing EMIs already use the whole FOIR limit.")
+        return
+    
+    selected = TENURES.tolist().index(tenure)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Maximum Loan", format_currency(loans[selected]))
+    with col2:
+        st.metric("Maximum Property Price", format_currency(prices[selected]))
+    st.dataframe(
+        pd.DataFrame({
+            'Tenure (Years)': TENURES,
+            'Max Loan': [format_currency(v) for v in loans],
+            'Max Price': [format_currency(v) for v in prices],
+        }),
+        hide_index=True,
+        use_container_width=True
+    )
+    
+    try:
+        model = get_registry().production
+    except Exception as e:
+        st.error(f"Failed to load model: {str(e)}")
+        return
+    
+    homes = feasible_homes(model, dict(enumerate(model_locations(model))), prices, TENURES)
+    homes = homes[homes['tenure'] == tenure]
+    st.markdown(f"### 🏘️ Homes Within {format_currency(prices[selected])}")
+    if homes.empty:
+        st.info("No location fits this budget with a realistic area; try a longer tenure or larger down payment.")
+        return
+    
+    counts = homes.groupby('bhk').size()
+    st.caption(" · ".join(
+        f"{bhk} BHK: {counts.get(bhk, 0)} locations" for bhk, _ in CONFIGURATIONS
+    ))
+    table = homes.pivot(index='location', columns='bhk', values='max_area')
+    table.columns = [f"{bhk} BHK (max sq ft)" for bhk in table.columns]
+    st.dataframe(
+        table.sort_values(table.columns[-1], ascending=False).round(0),
+        use_container_width=True
+    )
+
+@st.fragment
+def show_emi_calculator():
+    """Loan form and its EMI breakdown; reruns on its own when submitted"""
     # Create a form for input
     with st.form("emi_calculator"):
         col1, col2 = st.columns(2)
@@ -103,57 +231,15 @@ def app():
         # Detailed Breakdown
         st.markdown("### 📈 Payment Breakdown")
         
-        # Create pie chart for payment breakdown
-        fig_pie = go.Figure(data=[
-            go.Pie(
-                labels=['Principal', 'Interest'],
-                values=[actual_loan, total_interest],
-                hole=0.5,
-                marker_colors=['#1E88E5', '#FFC107']
-            )
-        ])
-        
-        fig_pie.update_layout(
-            title="Principal vs Interest Distribution",
-            showlegend=True
-        )
-        
-        st.plotly_chart(fig_pie, use_container_width=True)
+        st.plotly_chart(breakdown_figure(actual_loan, total_interest), use_container_width=True)
         
         # Year-wise payment schedule
         st.markdown("### 📅 Year-wise Payment Schedule")
-        
-        # Calculate year-wise data
-        years = np.arange(1, loan_tenure + 1)
-        yearly_payment = monthly_emi * 12
-        balance = np.zeros(loan_tenure)
-        
-        remaining_balance = actual_loan
-        for i in range(loan_tenure):
-            interest_yearly = remaining_balance * (interest_rate / 100)
-            principal_yearly = yearly_payment - interest_yearly
-            remaining_balance -= principal_yearly
-            balance[i] = remaining_balance
-        
-        # Create amortization schedule chart
-        fig_schedule = go.Figure()
-        
-        fig_schedule.add_trace(go.Scatter(
-            x=years,
-            y=balance,
-            name='Outstanding Balance',
-            line=dict(color='#1E88E5')
-        ))
-        
-        fig_schedule.update_layout(
-            title='Outstanding Loan Balance Over Time',
-            xaxis_title='Year',
-            yaxis_title='Outstanding Balance (₹)',
-            showlegend=True
+        st.plotly_chart(
+            balance_figure(actual_loan, interest_rate, loan_tenure, monthly_emi),
+            use_container_width=True
         )
         
-        st.plotly_chart(fig_schedule, use_container_width=True)
-        
         # Additional Information
         with st.expander("💡 Additional Details"):
             st.markdown(f"""
@@ -175,5 +261,14 @@ def app():
         - Consider pre-payment options
         """)
 
+def app():
+    st.title("💰 Home Loan EMI Calculator")
+    show_emi_calculator()
+    
+    # Affordability: from income to the homes the loan can buy
+    st.markdown("---")
+    st.header("🏡 What Can I Afford?")
+    show_affordability()
+
 if __name__ == "__main__":
-    app()
+    run_page(app, "EMI Calculator")
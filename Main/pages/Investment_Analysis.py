@@ -1,18 +1,137 @@
 import streamlit as st
 import numpy as np
 import pandas as pd
+import finance
+from page_profiler import run_page
+
+HOLDING_COLUMNS = ('purchase_price', 'expected_value', 'monthly_rent', 'period_years')
 
 def calculate_roi(purchase_price, current_value, rental_income, years):
-    """Calculate ROI for real estate investment"""
-    total_return = current_value - purchase_price + (rental_income * 12 * years)
-    roi = (total_return / purchase_price) * 100
-    return roi
+    """Calculate ROI for real estate investment; also works on whole columns"""
+    return finance.roi(purchase_price, current_value, rental_income, years)
 
 def calculate_rental_yield(property_value, monthly_rent):
-    """Calculate annual rental yield"""
-    annual_rent = monthly_rent * 12
-    rental_yield = (annual_rent / property_value) * 100
-    return rental_yield
+    """Calculate annual rental yield; also works on whole columns"""
+    return finance.rental_yield(property_value, monthly_rent)
+
+def calculate_irr(purchase_price, sale_price, monthly_rent, years, down_payment=100, loan_rate=0, tenure=1):
+    """Annual IRR (%) from monthly cash flows; arguments may be whole columns"""
+    flows = finance.property_cash_flows(purchase_price, down_payment, loan_rate, tenure, monthly_rent, years, sale_price)
+    return finance.irr(flows) * 100
+
+def show_cash_flow_returns(purchase_price, current_value, monthly_rent, investment_period):
+    """IRR and NPV with loan financing, and IRR across holding periods"""
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        down_payment = st.number_input("Down Payment (%)", min_value=10, max_value=100, value=20, step=5)
+    with col2:
+        loan_rate = st.number_input("Loan Rate (%)", min_value=0.0, max_value=20.0, value=8.5, step=0.1)
+    with col3:
+        tenure = st.number_input("Loan Tenure (Years)", min_value=1, max_value=30, value=20)
+    with col4:
+        discount_rate = st.number_input("Discount Rate (%)", min_value=0.0, max_value=30.0, value=7.0, step=0.5)
+    
+    flows = finance.property_cash_flows(
+        purchase_price, down_payment, loan_rate, tenure, monthly_rent, investment_period, current_value
+    )
+    irr = finance.irr(flows)[0] * 100
+    npv = finance.npv(discount_rate / 100, flows)[0]
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("IRR (annual)", "n/a" if np.isnan(irr) else f"{irr:.1f}%")
+    with col2:
+        st.metric(f"NPV at {discount_rate:.1f}%", ('-' if npv < 0 else '') + format_currency(abs(npv)))
+    
+    # Hold for 1-30 years with the value growing at the same annual rate,
+    # solved as one batch of scenarios
+    growth = (current_value / purchase_price) ** (1 / investment_period)
+    periods = np.arange(1, 31)
+    sweep = calculate_irr(
+        purchase_price, purchase_price * growth ** periods, monthly_rent, periods,
+        down_payment, loan_rate, tenure
+    )
+    st.markdown("**IRR by Holding Period**")
+    st.line_chart(pd.DataFrame({'Years Held': periods, 'IRR (%)': sweep}), x='Years Held', y='IRR (%)')
+
+@st.cache_data(max_entries=10)
+def analyse_portfolio(holdings):
+    """Per-holding returns for a portfolio, computed column-wise"""
+    missing = [col for col in HOLDING_COLUMNS if col not in holdings.columns]
+    if missing:
+        raise ValueError(f"Holdings file is missing columns: {', '.join(missing)}")
+    
+    df = holdings.copy()
+    for col in HOLDING_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    df = df.dropna(subset=list(HOLDING_COLUMNS))
+    df = df[(df['purchase_price'] > 0) & (df['period_years'] > 0)]
+    
+    df['appreciation'] = df['expected_value'] - df['purchase_price']
+    df['rental_income'] = df['monthly_rent'] * 12 * df['period_years']
+    df['total_return'] = df['appreciation'] + df['rental_income']
+    df['roi_pct'] = calculate_roi(df['purchase_price'], df['expected_value'], df['monthly_rent'], df['period_years'])
+    df['annual_roi_pct'] = df['roi_pct'] / df['period_years']
+    df['appreciation_pct'] = df['appreciation'] / df['purchase_price'] * 100
+    df['rental_yield_pct'] = calculate_rental_yield(df['purchase_price'], df['monthly_rent'])
+    df['irr_pct'] = calculate_irr(df['purchase_price'], df['expected_value'], df['monthly_rent'], df['period_years'])
+    return df
+
+def summarize_portfolio(df):
+    """Portfolio totals; percentages are weighted by purchase price"""
+    invested = df['purchase_price'].sum()
+    return {
+        'holdings': len(df),
+        'invested': invested,
+        'expected_value': df['expected_value'].sum(),
+        'total_return': df['total_return'].sum(),
+        'roi_pct': df['total_return'].sum() / invested * 100,
+        'annual_roi_pct': (df['annual_roi_pct'] * df['purchase_price']).sum() / invested,
+        'appreciation_pct': df['appreciation'].sum() / invested * 100,
+        'rental_yield_pct': df['monthly_rent'].sum() * 12 / invested * 100,
+    }
+
+def show_portfolio():
+    """Upload holdings and show returns across the whole portfolio"""
+    st.caption("Upload a CSV or Excel file with one row per holding and the columns "
+               "`purchase_price`, `expected_value`, `monthly_rent` (₹) and `period_years`.")
+    uploaded = st.file_uploader("Holdings file", type=["csv", "xlsx"])
+    if uploaded is None:
+        return
+    
+    holdings = pd.read_excel(uploaded) if uploaded.name.lower().endswith('.xlsx') else pd.read_csv(uploaded)
+    try:
+        df = analyse_portfolio(holdings)
+    except ValueError as e:
+        st.error(str(e))
+        return
+    if df.empty:
+        st.warning("No holdings with a valid purchase price and period.")
+        return
+    
+    summary = summarize_portfolio(df)
+    if summary['holdings'] < len(holdings):
+        st.caption(f"Skipped {len(holdings) - summary['holdings']} rows with missing or invalid values.")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Holdings", f"{summary['holdings']:,}")
+        st.metric("Total Invested", format_currency(summary['invested']))
+    with col2:
+        st.metric("Portfolio ROI", f"{summary['roi_pct']:.1f}%", f"{summary['annual_roi_pct']:.1f}% per year")
+        st.metric("Total Returns", format_currency(summary['total_return']))
+    with col3:
+        st.metric("Appreciation", f"{summary['appreciation_pct']:.1f}%")
+        st.metric("Expected Value", format_currency(summary['expected_value']))
+    with col4:
+        st.metric("Rental Yield", f"{summary['rental_yield_pct']:.1f}%")
+    
+    st.markdown("### Holdings")
+    st.dataframe(
+        df.sort_values('roi_pct', ascending=False).round(2),
+        hide_index=True,
+        use_container_width=True
+    )
 
 def format_currency(amount):
     """Format amount in Indian currency"""
@@ -73,11 +192,12 @@ def main():
     if st.button("Calculate Returns", use_container_width=True):
         roi = calculate_roi(purchase_price, current_value, monthly_rent, investment_period)
         rental_yield = calculate_rental_yield(purchase_price, monthly_rent)
+        irr = calculate_irr(purchase_price, current_value, monthly_rent, investment_period)[0]
         total_return = current_value - purchase_price + (monthly_rent * 12 * investment_period)
         
         # Display results
         st.markdown("### Investment Summary")
-        col1, col2, col3 = st.columns(3)
+        col1, col2, col3, col4 = st.columns(4)
         
         with col1:
             st.metric("Total ROI", f"{roi:.1f}%", f"{roi/investment_period:.1f}% per year")
@@ -85,6 +205,9 @@ def main():
             st.metric("Total Returns", format_currency(total_return))
         with col3:
             st.metric("Rental Yield", f"{rental_yield:.1f}%")
+        with col4:
+            st.metric("IRR (annual)", "n/a" if np.isnan(irr) else f"{irr:.1f}%",
+                      help="Time-weighted return of monthly rent and the sale, bought outright")
         
         # Breakdown
         st.markdown("### Returns Breakdown")
@@ -96,6 +219,16 @@ def main():
         💰 **Rental Income:** {format_currency(rental_returns)}
         """)
     
+    # Returns with financing and the time value of money
+    st.markdown("---")
+    st.header("Cash-Flow Returns")
+    show_cash_flow_returns(purchase_price, current_value, monthly_rent, investment_period)
+    
+    # Portfolio mode
+    st.markdown("---")
+    st.header("Portfolio Analysis")
+    show_portfolio()
+    
     # Investment Options
     st.markdown("---")
     st.header("Investment Comparison")
@@ -139,4 +272,4 @@ def main():
         """)
 
 if __name__ == "__main__":
-    main()
+    run_page(main, "Investment Analysis")
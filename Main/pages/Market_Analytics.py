@@ -4,10 +4,15 @@ import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
 from pathlib import Path
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from geo_index import GeoIndex, build_geo_index, load_coordinates
+import warmup
+from page_profiler import run_page
 
 def format_price_lakhs(price):
     return f"₹{price:.2f} L"
 
+@st.cache_data
 def generate_sample_data():
     # Generate sample data for visualizations
     locations = [
@@ -29,10 +34,209 @@ def generate_sample_data():
     
     return pd.DataFrame(data)
 
+@st.cache_data
+def filter_data(locations, min_area, max_area):
+    """Listings for the selected locations and area range"""
+    df = generate_sample_data()
+    return df[
+        (df['location'].isin(locations)) &
+        (df['area'] >= min_area) &
+        (df['area'] <= max_area)
+    ]
+
+@st.cache_data
+def price_trend_figures(locations, min_area, max_area):
+    """Monthly trend and price distribution charts"""
+    filtered_df = filter_data(locations, min_area, max_area)
+    
+    # Monthly average price trend
+    monthly_avg = filtered_df.groupby(filtered_df['month'].dt.to_period('M'))['price'].mean().reset_index()
+    monthly_avg['month'] = monthly_avg['month'].astype(str)
+    
+    fig_trend = px.line(
+        monthly_avg,
+        x='month',
+        y='price',
+        title='Average Property Prices Over Time',
+        labels={'price': 'Price (Lakhs)', 'month': 'Month'}
+    )
+    fig_trend.update_traces(line_color='#1E88E5')
+    
+    # Price Distribution
+    fig_dist = px.histogram(
+        filtered_df,
+        x='price',
+        nbins=30,
+        title='Price Distribution',
+        labels={'price': 'Price (Lakhs)', 'count': 'Number of Properties'}
+    )
+    fig_dist.update_traces(marker_color='#1E88E5')
+    return fig_trend, fig_dist
+
+@st.cache_data
+def location_figures(locations, min_area, max_area):
+    """Average price and price per sq ft by location"""
+    filtered_df = filter_data(locations, min_area, max_area)
+    
+    # Average price by location
+    location_avg = filtered_df.groupby('location')['price'].agg(['mean', 'count']).reset_index()
+    location_avg = location_avg.sort_values('mean', ascending=True)
+    
+    fig_location = go.Figure()
+    fig_location.add_trace(go.Bar(
+        y=location_avg['location'],
+        x=location_avg['mean'],
+        orientation='h',
+        marker_color='#1E88E5',
+        name='Average Price'
+    ))
+    
+    fig_location.update_layout(
+        title='Average Property Prices by Location',
+        xaxis_title='Price (Lakhs)',
+        yaxis_title='Location',
+        height=400 + len(location_avg) * 20
+    )
+    
+    # Price per sq ft by location
+    location_price_per_sqft = filtered_df.groupby('location')['price_per_sqft'].mean().sort_values(ascending=True)
+    
+    fig_price_sqft = px.bar(
+        location_price_per_sqft,
+        orientation='h',
+        title='Average Price per Square Foot by Location',
+        labels={'value': 'Price per sq ft (₹)', 'location': 'Location'}
+    )
+    fig_price_sqft.update_traces(marker_color='#1E88E5')
+    return fig_location, fig_price_sqft
+
+@st.cache_data
+def configuration_figures(locations, min_area, max_area):
+    """Average price by BHK and the area vs price scatter"""
+    filtered_df = filter_data(locations, min_area, max_area)
+    
+    # Average price by BHK
+    bhk_avg = filtered_df.groupby('bhk')['price'].mean().reset_index()
+    
+    fig_bhk = px.bar(
+        bhk_avg,
+        x='bhk',
+        y='price',
+        title='Average Price by BHK',
+        labels={'price': 'Price (Lakhs)', 'bhk': 'Number of Bedrooms'}
+    )
+    fig_bhk.update_traces(marker_color='#1E88E5')
+    
+    # Area vs Price Scatter Plot
+    fig_scatter = px.scatter(
+        filtered_df,
+        x='area',
+        y='price',
+        color='bhk',
+        title='Price vs Area by BHK',
+        labels={'price': 'Price (Lakhs)', 'area': 'Area (sq ft)', 'bhk': 'BHK'}
+    )
+    return fig_bhk, fig_scatter
+
+@st.cache_resource
+def load_neighbourhood_index():
+    """Saved geo index if one was built from listings, else one over the sample data"""
+    index = warmup.geo_index()
+    if index is None:
+        sample = generate_sample_data().rename(columns={'area': 'total_sqft'})
+        index = GeoIndex(build_geo_index(sample, load_coordinates()))
+    return index
+
+@st.fragment
+def show_neighbourhood():
+    """Median price and cheapest localities within a radius of a locality or point"""
+    geo = load_neighbourhood_index()
+    names = sorted(geo.locations.tolist())
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        centre = st.selectbox("Near", names, key="geo_centre")
+        lat, lon = geo.locate(centre)
+        if st.checkbox("Use exact coordinates (e.g. your office)", key="geo_custom"):
+            lat = st.number_input("Latitude", value=lat, format="%.4f", key="geo_lat")
+            lon = st.number_input("Longitude", value=lon, format="%.4f", key="geo_lon")
+    with col2:
+        radius = st.slider("Radius (km)", 1, 25, 5, key="geo_radius")
+    
+    result = geo.median_within(lat, lon, radius)
+    if result is None:
+        st.info(f"No listings within {radius} km.")
+        return
+    median, count = result
+    st.metric(f"Median Price/Sq ft within {radius} km", f"₹{median:,.0f}", help=f"From {count} listings")
+    
+    st.subheader("Cheapest Localities Nearby")
+    nearby = geo.cheapest_near(lat, lon, radius)
+    st.dataframe(
+        nearby.rename(columns={
+            'location': 'Location', 'distance_km': 'Distance (km)',
+            'median_price_per_sqft': 'Median Price/Sq ft (₹)', 'listings': 'Listings'
+        }).style.format({'Distance (km)': '{:.1f}', 'Median Price/Sq ft (₹)': '{:,.0f}'}),
+        hide_index=True, use_container_width=True
+    )
+
+TAB_BUILDERS = (price_trend_figures, location_figures, configuration_figures)
+
+def precompute_hidden_tabs(filters, open_tabs):
+    """Fill the figure cache for tabs that aren't showing, off the rerun path"""
+    ctx = get_script_run_ctx()
+    for builder, is_open in zip(TAB_BUILDERS, open_tabs):
+        if not is_open:
+            warmup.precompute_pool().submit(_run_with_ctx, ctx, builder, filters)
+
+def _run_with_ctx(ctx, builder, filters):
+    add_script_run_ctx(ctx=ctx)
+    builder(*filters)
+
+@st.fragment
+def show_market_tabs(filters):
+    """Chart tabs for the current filters; switching tabs reruns only this section"""
+    # Only the selected tab's content runs; the others are warmed in the background
+    tab1, tab2, tab3, tab4 = st.tabs(
+        ["Price Trends", "Location Analysis", "Configuration Analysis", "Neighbourhood"],
+        key="analytics_tab",
+        on_change="rerun"
+    )
+    
+    if tab1.open:
+        with tab1:
+            st.subheader("Price Trends Over Time")
+            fig_trend, fig_dist = price_trend_figures(*filters)
+            st.plotly_chart(fig_trend, use_container_width=True)
+            st.plotly_chart(fig_dist, use_container_width=True)
+    
+    if tab2.open:
+        with tab2:
+            st.subheader("Location-wise Analysis")
+            fig_location, fig_price_sqft = location_figures(*filters)
+            st.plotly_chart(fig_location, use_container_width=True)
+            
+            st.subheader("Price per Square Foot Analysis")
+            st.plotly_chart(fig_price_sqft, use_container_width=True)
+    
+    if tab3.open:
+        with tab3:
+            st.subheader("Configuration Analysis")
+            fig_bhk, fig_scatter = configuration_figures(*filters)
+            st.plotly_chart(fig_bhk, use_container_width=True)
+            st.plotly_chart(fig_scatter, use_container_width=True)
+    
+    if tab4.open:
+        with tab4:
+            st.subheader("Neighbourhood Prices")
+            show_neighbourhood()
+    
+    precompute_hidden_tabs(filters, [tab.open for tab in (tab1, tab2, tab3)])
+
 def app():
     st.title("📊 Market Analytics")
     
-    # Generate sample data
+    # Sample data is generated once and cached
     df = generate_sample_data()
     
     # Sidebar for filters
@@ -50,107 +254,12 @@ def app():
         (800.0, 2000.0)
     )
     
-    # Filter data
-    filtered_df = df[
-        (df['location'].isin(selected_locations)) &
-        (df['area'] >= min_area) &
-        (df['area'] <= max_area)
-    ]
+    # Figures and filtered data are cached on the filter values, so a rerun
+    # only rebuilds what those values actually change
+    filters = (tuple(sorted(selected_locations)), min_area, max_area)
+    filtered_df = filter_data(*filters)
     
-    # Create tabs for different analyses
-    tab1, tab2, tab3 = st.tabs(["Price Trends", "Location Analysis", "Configuration Analysis"])
-    
-    with tab1:
-        st.subheader("Price Trends Over Time")
-        
-        # Monthly average price trend
-        monthly_avg = filtered_df.groupby(filtered_df['month'].dt.to_period('M'))['price'].mean().reset_index()
-        monthly_avg['month'] = monthly_avg['month'].astype(str)
-        
-        fig_trend = px.line(
-            monthly_avg,
-            x='month',
-            y='price',
-            title='Average Property Prices Over Time',
-            labels={'price': 'Price (Lakhs)', 'month': 'Month'}
-        )
-        fig_trend.update_traces(line_color='#1E88E5')
-        st.plotly_chart(fig_trend, use_container_width=True)
-        
-        # Price Distribution
-        fig_dist = px.histogram(
-            filtered_df,
-            x='price',
-            nbins=30,
-            title='Price Distribution',
-            labels={'price': 'Price (Lakhs)', 'count': 'Number of Properties'}
-        )
-        fig_dist.update_traces(marker_color='#1E88E5')
-        st.plotly_chart(fig_dist, use_container_width=True)
-    
-    with tab2:
-        st.subheader("Location-wise Analysis")
-        
-        # Average price by location
-        location_avg = filtered_df.groupby('location')['price'].agg(['mean', 'count']).reset_index()
-        location_avg = location_avg.sort_values('mean', ascending=True)
-        
-        fig_location = go.Figure()
-        fig_location.add_trace(go.Bar(
-            y=location_avg['location'],
-            x=location_avg['mean'],
-            orientation='h',
-            marker_color='#1E88E5',
-            name='Average Price'
-        ))
-        
-        fig_location.update_layout(
-            title='Average Property Prices by Location',
-            xaxis_title='Price (Lakhs)',
-            yaxis_title='Location',
-            height=400 + len(location_avg) * 20
-        )
-        st.plotly_chart(fig_location, use_container_width=True)
-        
-        # Price per sq ft by location
-        st.subheader("Price per Square Foot Analysis")
-        location_price_per_sqft = filtered_df.groupby('location')['price_per_sqft'].mean().sort_values(ascending=True)
-        
-        fig_price_sqft = px.bar(
-            location_price_per_sqft,
-            orientation='h',
-            title='Average Price per Square Foot by Location',
-            labels={'value': 'Price per sq ft (₹)', 'location': 'Location'}
-        )
-        fig_price_sqft.update_traces(marker_color='#1E88E5')
-        st.plotly_chart(fig_price_sqft, use_container_width=True)
-    
-    with tab3:
-        st.subheader("Configuration Analysis")
-        
-        # Average price by BHK
-        bhk_avg = filtered_df.groupby('bhk')['price'].mean().reset_index()
-        
-        fig_bhk = px.bar(
-            bhk_avg,
-            x='bhk',
-            y='price',
-            title='Average Price by BHK',
-            labels={'price': 'Price (Lakhs)', 'bhk': 'Number of Bedrooms'}
-        )
-        fig_bhk.update_traces(marker_color='#1E88E5')
-        st.plotly_chart(fig_bhk, use_container_width=True)
-        
-        # Area vs Price Scatter Plot
-        fig_scatter = px.scatter(
-            filtered_df,
-            x='area',
-            y='price',
-            color='bhk',
-            title='Price vs Area by BHK',
-            labels={'price': 'Price (Lakhs)', 'area': 'Area (sq ft)', 'bhk': 'BHK'}
-        )
-        st.plotly_chart(fig_scatter, use_container_width=True)
+    show_market_tabs(filters)
     
     # Key Insights
     st.subheader("💡 Key Market Insights")
@@ -177,4 +286,4 @@ def app():
     """)
 
 if __name__ == "__main__":
-    app()
+    run_page(app, "Market Analytics")
@@ -1,29 +1,53 @@
 import streamlit as st
-import pickle
 import numpy as np
+import pandas as pd
+import plotly.express as px
 from pathlib import Path
+from functools import partial
+from price_index import percentile_rank
+from locality_search import model_locations, popular_locations, search_index
+from model_registry import get_registry
+from price_model import price_curves, max_affordable_area, sparse_prediction_interval
+from property_features import base_width, encode_property
+from prediction_log import log_prediction
+from report_export import (EXPORT_FORMATS, PortfolioScorer, discard_report, export_report,
+                           read_portfolio, take_report)
+import warmup
+from page_profiler import run_page
 
 def load_model():
     try:
-        model_path = Path(__file__).parent.parent.parent / 'banglore_home_prices_model.pickle'
-        with open(model_path, 'rb') as f:
-            model = pickle.load(f)
-        return model
+        return get_registry()
     except Exception as e:
         st.error(f"Failed to load model: {str(e)}")
         return None
 
+def load_price_index():
+    """Precomputed price per sq ft index, shared with the app's warm-up.
+
+    Prefers the shared, memory-mapped copy when one has been published.
+    """
+    return warmup.price_index()
+
+def load_comparables_index():
+    """Memory-mapped comparable listings index, shared with the app's warm-up"""
+    return warmup.comparables_index()
+
 def get_location_map():
-    return {
-        0: "Whitefield", 10: "HSR Layout", 20: "Electronic City", 
-        30: "Marathahalli", 40: "Koramangala", 50: "Indiranagar", 
-        60: "JP Nagar", 70: "Bannerghatta Road", 80: "Sarjapur Road", 
-        90: "Hebbal", 100: "Banashankari", 110: "BTM Layout", 
-        120: "Jayanagar", 130: "Bellandur", 140: "CV Raman Nagar",
-        150: "Malleswaram", 160: "Old Airport Road", 170: "Rajaji Nagar", 
-        180: "Yelahanka", 190: "KR Puram", 200: "Mahadevapura", 
-        210: "Thanisandra", 220: "Kengeri", 230: "Hoodi"
-    }
+    """Map location indices to the model's locality names"""
+    model = load_model()
+    if model is None:
+        return {}
+    return dict(enumerate(model_locations(model.production)))
+
+def location_picker(label, locations):
+    """Selectbox with a typo-tolerant search box in front of it"""
+    query = st.text_input(f"Search {label.lower()}", placeholder="Start typing, e.g. Koramangala")
+    options = search_index(tuple(locations)).search(query, limit=50) if query else sorted(locations)
+    if not options:
+        st.caption("No matching localities")
+        options = sorted(locations)
+    return st.selectbox(label, options)
 
 def format_price(price):
     """Format price in lakhs with Indian number system"""
@@ -45,6 +69,142 @@ def format_price(price):
     final_price = f"{formatted}.{decimal}"
     return f"₹{final_price} Lakhs"
 
+def model_version(registry):
+    """Resolved path and mtime of the production model, identifying it across reloads"""
+    path = Path(registry.production_path).resolve()
+    return str(path), path.stat().st_mtime
+
+@st.cache_data(max_entries=100)
+def comparison_figure(_model, version, loc_indices, names, min_area, max_area, bhk, bath):
+    """Price vs area curves for a set of locations, memoized on the inputs.
+
+    The model itself isn't hashed; `version` (see `model_version`) changes
+    when a different model file is loaded.
+    """
+    areas = np.linspace(min_area, max_area, 50)
+    prices = price_curves(_model, np.array(loc_indices, dtype=int), areas, bhk, bath)
+    
+    curves = pd.DataFrame({
+        'location': np.repeat(names, len(areas)),
+        'area': np.tile(areas, len(loc_indices)),
+        'price': prices.ravel()
+    })
+    fig = px.line(
+        curves,
+        x='area',
+        y='price',
+        color='location',
+        title=f'Price vs Area by Location ({bhk} BHK, {bath} Baths)',
+        labels={'price': 'Price (Lakhs)', 'area': 'Area (sq ft)', 'location': 'Location'}
+    )
+    return fig
+
+@st.fragment
+def show_location_comparison(model, version, bhk, bath):
+    """Plot price vs area for the chosen locations with the current configuration"""
+    min_area, max_area = st.slider(
+        "Area Range (sq ft)",
+        min_value=300,
+        max_value=5000,
+        value=(600, 2500),
+        step=100
+    )
+    
+    location_map = get_location_map()
+    selected = st.multiselect(
+        "Locations",
+        options=sorted(location_map.values()),
+        default=popular_locations(location_map.values())
+    )
+    location_map_inv = {v: k for k, v in location_map.items()}
+    loc_indices = tuple(location_map_inv[name] for name in selected)
+    fig = comparison_figure(model, version, loc_indices, tuple(selected), min_area, max_area, bhk, bath)
+    st.plotly_chart(fig, use_container_width=True)
+
+@st.fragment
+def show_budget_search(model, bhk, bath):
+    """Rank locations by the largest area affordable within a budget"""
+    budget = st.number_input(
+        "Budget (Lakhs)",
+        min_value=10.0,
+        max_value=5000.0,
+        value=100.0,
+        step=5.0
+    )
+    
+    location_map = get_location_map()
+    loc_indices = np.array(list(location_map.keys()))
+    max_area = max_affordable_area(model, loc_indices, budget, bhk, bath)
+    
+    results = pd.DataFrame({
+        'Location': list(location_map.values()),
+        'Max Area (sq ft)': max_area
+    }).sort_values('Max Area (sq ft)', ascending=False, na_position='last')
+    
+    affordable = results['Max Area (sq ft)'].notna()
+    st.markdown(f"**{bhk} BHK, {bath} Baths** is within {format_price(budget)} in "
+                f"{affordable.sum()} of {len(results)} locations")
+    st.dataframe(
+        results[affordable].round(0),
+        hide_index=True,
+        use_container_width=True
+    )
+
+@st.fragment
+def show_bulk_export(model):
+    """Score an uploaded portfolio and offer the report as a download"""
+    st.caption("Upload a CSV or Excel file with `location`, `total_sqft`, `bhk` and `bath` columns, "
+               "plus optional `purchase_price` (₹) and `monthly_rent` (₹). Rows in locations the model "
+               "doesn't know are left unpriced (`known_location` is False).")
+    uploaded = st.file_uploader("Portfolio file", type=["csv", "xlsx"])
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        rate = st.number_input("Interest Rate (%)", min_value=1.0, max_value=20.0, value=8.5, step=0.1)
+    with col2:
+        tenure = st.number_input("Loan Tenure (Years)", min_value=1, max_value=30, value=20)
+    with col3:
+        down_payment = st.number_input("Down Payment (%)", min_value=0, max_value=100, value=20)
+    with col4:
+        years = st.number_input("Holding Period (Years)", min_value=1, max_value=30, value=5)
+    fmt = st.radio("Format", list(EXPORT_FORMATS), horizontal=True)
+    float32 = st.checkbox("Reduced precision (float32)",
+                          help="Halves the memory used for scoring; only used if it stays within ₹1,000 of full precision")
+    
+    if uploaded is not None and st.button("Generate Report"):
+        scorer = PortfolioScorer(model.production, rate, tenure, down_payment, years,
+                                 model_name=Path(model.production_path).name, float32=float32)
+        if float32 and scorer.dtype is not np.float32:
+            st.warning("This model loses too much accuracy in float32; scoring in full precision.")
+        try:
+            with st.spinner("Scoring portfolio..."):
+                path, rows = export_report(scorer.score_chunks(read_portfolio(uploaded)), fmt)
+        except ValueError as e:
+            st.error(str(e))
+            return
+        previous = st.session_state.get('bulk_report')
+        if previous is not None:
+            discard_report(previous[0])
+        st.session_state['bulk_report'] = (path, rows, fmt)
+    
+    report = st.session_state.get('bulk_report')
+    if report is not None and not Path(report[0]).exists():
+        # Swept after REPORT_MAX_AGE without being downloaded
+        st.session_state.pop('bulk_report', None)
+        st.info("That report expired before it was downloaded; generate it again.")
+    elif report is not None:
+        path, rows, fmt = report
+        extension, mime = EXPORT_FORMATS[fmt]
+        # The file is only read when the button is clicked, and deleted once
+        # it has been sent; the button goes with it
+        st.download_button(
+            f"Download {rows:,} rows ({fmt})",
+            data=partial(take_report, path),
+            file_name=f"portfolio_report.{extension}",
+            mime=mime,
+            on_click=lambda: st.session_state.pop('bulk_report', None)
+        )
+
 def app():
     st.title("🏠 House Price Prediction")
     
@@ -117,11 +277,7 @@ def app():
             )
         
         with st.expander("📍 Location Details", expanded=True):
-            locations = sorted(get_location_map().values())
-            location = st.selectbox(
-                "Location",
-                locations
-            )
+            location = location_picker("Location", get_location_map().values())
             
             amenities = st.multiselect(
                 "Nearby Amenities",
@@ -136,21 +292,23 @@ def app():
             if model is None:
                 return
             
-            # Prepare input features
-            x = np.zeros(244)  # Model expects 244 features
-            
-            # Set basic features
-            x[0] = area
-            x[1] = bath
-            x[2] = bhk
-            
-            # Set location feature
+            # Encode the property sparsely: base features, location and any
+            # attributes the model was trained on
             location_map_inv = {v: k for k, v in get_location_map().items()}
             loc_index = location_map_inv[location]
-            x[3 + loc_index] = 1
+            indices, values = encode_property(
+                area, bath, bhk, loc_index, base_width(model.production),
+                property_age=property_age,
+                floor_num=floor_num,
+                total_floors=total_floors,
+                furnishing=furnishing,
+                parking=parking,
+                facing=facing,
+                amenities=amenities
+            )
             
             # Make prediction
-            predicted_price = model.predict([x])[0]
+            predicted_price = model.predict_sparse(indices, values)
             
             # Display result in a nice card
             st.markdown("---")
@@ -168,6 +326,11 @@ def app():
                 st.markdown("### Estimated Price")
                 st.markdown(f"<h2 style='color: #1E88E5;'>{format_price(predicted_price)}</h2>", 
                           unsafe_allow_html=True)
+                interval = sparse_prediction_interval(model.production, indices, values)
+                if interval is not None:
+                    low, high = interval
+                    st.caption(f"95% range: {format_price(max(low, 0))} – {format_price(high)}")
+                log_prediction('streamlit', model, location, area, bhk, bath, predicted_price, interval)
             
             # Additional price insights
             st.markdown("### 💡 Price Insights")
@@ -178,15 +341,58 @@ def app():
                 st.metric("Price per sq ft", f"₹{price_per_sqft:,.2f}")
             
             with col_insights2:
-                avg_price = 6000  # This should be calculated from your data
+                price_index = load_price_index()
+                area_stats = price_index.lookup(location, bhk) if price_index else None
+                avg_price = area_stats['median'] if area_stats else 6000
                 price_diff = ((price_per_sqft - avg_price) / avg_price) * 100
                 st.metric("Comparison to Area Average", 
                          f"{abs(price_diff):.1f}% {'above' if price_diff > 0 else 'below'} average")
+                if area_stats:
+                    rank = percentile_rank(area_stats, price_per_sqft)
+                    pcts = area_stats['percentiles']
+                    st.caption(
+                        f"Around the {rank:.0f}th percentile of {area_stats['count']} listings in {location} "
+                        f"(middle 50%: ₹{pcts[25]:,.0f} – ₹{pcts[75]:,.0f} per sq ft)"
+                    )
+                else:
+                    st.caption("No local listing data for this location; compared against a city-wide ₹6,000/sq ft.")
+            
+            # Actual listings most similar to the requested property
+            comparables = load_comparables_index()
+            if comparables is not None:
+                similar = comparables.similar(location, area, bhk, bath, k=5)
+                if len(similar) > 0:
+                    st.markdown("### 🏘️ Similar Properties")
+                    st.dataframe(
+                        similar.rename(columns={
+                            'total_sqft': 'Area (sq ft)', 'bhk': 'BHK',
+                            'bath': 'Baths', 'price': 'Price (Lakhs)'
+                        }).drop(columns='distance'),
+                        hide_index=True,
+                        use_container_width=True
+                    )
             
             st.info("Note: This is an estimated price based on historical data and may vary from actual market prices.")
             
         except Exception as e:
             st.error(f"An error occurred: {str(e)}")
+    
+    # Compare the same configuration across all locations
+    st.markdown("---")
+    if st.checkbox("📈 Compare prices across locations"):
+        model = load_model()
+        if model is not None:
+            show_location_comparison(model.production, model_version(model), bhk, bath)
+    
+    if st.checkbox("💰 Search locations by budget"):
+        model = load_model()
+        if model is not None:
+            show_budget_search(model.production, bhk, bath)
+    
+    if st.checkbox("📦 Bulk portfolio report"):
+        model = load_model()
+        if model is not None:
+            show_bulk_export(model)
 
 if __name__ == "__main__":
-    app()
+    run_page(app, "Price Prediction")
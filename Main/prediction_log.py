@@ -0,0 +1,200 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+import pandas as pd
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # falls back to CSV files
+    pa = pq = None
+
+LOG_DIR = Path(os.environ.get('PRICEGENIE_PREDICTION_LOG', Path(__file__).parent.parent / 'prediction_logs'))
+COLUMNS = ('timestamp', 'source', 'model', 'location', 'area', 'bhk', 'bath', 'price', 'low', 'high')
+BATCH_ROWS = 1000
+FLUSH_SECONDS = 5.0
+ROTATE_ROWS = 100000
+ROTATE_SECONDS = 300
+MAX_QUEUE = 10000
+
+logger = logging.getLogger('pricegenie.predictions')
+
+if pa is not None:
+    SCHEMA = pa.schema([
+        ('timestamp', pa.timestamp('us')),
+        ('source', pa.string()),
+        ('model', pa.string()),
+        ('location', pa.string()),
+        ('area', pa.float64()),
+        ('bhk', pa.float64()),
+        ('bath', pa.float64()),
+        ('price', pa.float64()),
+        ('low', pa.float64()),
+        ('high', pa.float64()),
+    ])
+
+class PredictionLog:
+    """Append-only prediction log written by a background thread.
+
+    `record` and `record_batch` only put onto a bounded in-memory queue and
+    never block: when the writer falls behind, new entries are dropped and
+    counted rather than slowing the caller. The writer flushes every
+    BATCH_ROWS rows or FLUSH_SECONDS as one Parquet row group, and starts a
+    new file after ROTATE_ROWS rows or ROTATE_SECONDS. Files are named by
+    start time, process id and sequence number, so concurrent processes
+    never share one; a Parquet file is readable once it has been rotated
+    out or the log closed, which is why ROTATE_SECONDS is short: a crash
+    loses at most that many seconds of rows.
+    """
+
+    def __init__(self, path=LOG_DIR, max_queue=MAX_QUEUE):
+        self.path = Path(path)
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._rows = []
+        self._frames = []
+        self._buffered_rows = 0
+        self._writer = None
+        self._file = None
+        self._file_rows = 0
+        self._file_started = 0.0
+        self._file_count = 0
+        self._thread = threading.Thread(target=self._run, name='prediction-log', daemon=True)
+        self._thread.start()
+
+    def record(self, source, model, location, area, bhk, bath, price, low=None, high=None):
+        """Queue one prediction"""
+        self._put({
+            'timestamp': time.time(), 'source': source, 'model': str(model),
+            'location': location, 'area': float(area), 'bhk': float(bhk), 'bath': float(bath),
+            'price': float(price), 'low': None if low is None else float(low),
+            'high': None if high is None else float(high),
+        })
+
+    def record_batch(self, source, model, predictions):
+        """Queue a DataFrame of predictions (columns as in COLUMNS, missing ones left empty)"""
+        batch = predictions.reindex(columns=COLUMNS)
+        batch['timestamp'] = time.time()
+        batch['source'] = source
+        batch['model'] = str(model)
+        self._put(batch)
+
+    def _put(self, item):
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """Flush queued predictions and close the current file"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        last_flush = time.monotonic()
+        while True:
+            wait = max(FLUSH_SECONDS - (time.monotonic() - last_flush), 0.01)
+            try:
+                item = self._queue.get(timeout=wait)
+            except queue.Empty:
+                item = ...
+            if item is None:
+                break
+            if isinstance(item, pd.DataFrame):
+                self._frames.append(item)
+                self._buffered_rows += len(item)
+            elif item is not ...:
+                self._rows.append(item)
+                self._buffered_rows += 1
+            if self._buffered_rows >= BATCH_ROWS or time.monotonic() - last_flush >= FLUSH_SECONDS:
+                try:
+                    self._flush()
+                except Exception:
+                    logger.exception("Failed to write prediction log; dropping %d rows", self._buffered_rows)
+                    self._rows, self._frames, self._buffered_rows = [], [], 0
+                last_flush = time.monotonic()
+        self._flush()
+        self._close_file()
+
+    def _flush(self):
+        if self._writer is not None and time.time() - self._file_started >= ROTATE_SECONDS:
+            self._close_file()
+        if not self._buffered_rows:
+            return
+
+        # Single predictions are kept as dicts and only become a frame here
+        frames = self._frames + ([pd.DataFrame(self._rows, columns=COLUMNS)] if self._rows else [])
+        rows = pd.concat(frames, ignore_index=True)[list(COLUMNS)]
+        rows['timestamp'] = pd.to_datetime(rows['timestamp'].astype(float), unit='s')
+        self._rows, self._frames, self._buffered_rows = [], [], 0
+        if self._writer is None:
+            self._open_file()
+        if pq is not None:
+            self._writer.write_table(pa.Table.from_pandas(rows, schema=SCHEMA, preserve_index=False, safe=False))
+        else:
+            rows.to_csv(self._writer, header=self._file_rows == 0, index=False)
+            self._writer.flush()
+        self._file_rows += len(rows)
+        if self._file_rows >= ROTATE_ROWS:
+            self._close_file()
+
+    def _open_file(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        suffix = 'parquet' if pq is not None else 'csv'
+        self._file_count += 1
+        self._file = self.path / f'predictions-{stamp}-{os.getpid()}-{self._file_count:04d}.{suffix}'
+        self._writer = pq.ParquetWriter(self._file, SCHEMA) if pq is not None else open(self._file, 'w', newline='')
+        self._file_rows = 0
+        self._file_started = time.time()
+
+    def _close_file(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+_log = None
+_log_lock = threading.Lock()
+
+def get_prediction_log():
+    """Process-wide prediction log, started on first use.
+
+    A forked child gets its own log (and writer thread) rather than the
+    parent's, whose thread didn't survive the fork.
+    """
+    global _log
+    with _log_lock:
+        if _log is None or _log[0] != os.getpid():
+            log = PredictionLog()
+            atexit.register(log.close)
+            _log = (os.getpid(), log)
+        return _log[1]
+
+def close_prediction_log():
+    """Flush and close this process's log, e.g. before a worker exits with os._exit"""
+    global _log
+    with _log_lock:
+        if _log is not None and _log[0] == os.getpid():
+            _log[1].close()
+            _log = None
+
+def read_predictions(path=LOG_DIR):
+    """All logged predictions from finished and in-progress CSV files, or finished Parquet files"""
+    frames = []
+    for file in sorted(Path(path).glob('predictions-*')):
+        try:
+            frames.append(pd.read_parquet(file) if file.suffix == '.parquet' else pd.read_csv(file))
+        except Exception:
+            continue  # still being written
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=COLUMNS)
+
+def log_prediction(source, registry, location, area, bhk, bath, price, interval=None):
+    """Record one prediction made with a registry's production model"""
+    low, high = interval if interval is not None else (None, None)
+    get_prediction_log().record(
+        source, Path(registry.production_path).name, location, area, bhk, bath, price, low, high
+    )
@@ -0,0 +1,215 @@
+import argparse
+import json
+import logging
+import os
+import selectors
+import signal
+import socket
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from locality_search import model_locations
+from model_registry import CONFIG_PATH, reload_registry
+from prediction_log import close_prediction_log, log_prediction
+from price_model import sparse_prediction_interval
+from property_features import base_width, encode_property
+
+logger = logging.getLogger('pricegenie.server')
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    """JSON prediction endpoint: POST /predict, GET /health"""
+
+    registry = None
+    locations = {}
+    timeout = 10  # seconds a client may stall before its connection is dropped
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send(200, {'status': 'ok', 'pid': os.getpid()})
+        else:
+            self._send(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if self.path != '/predict':
+            self._send(404, {'error': 'not found'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length))
+            loc_index = self.locations[request['location']]
+            indices, values = encode_property(
+                float(request['area']), float(request['bath']), float(request['bhk']),
+                loc_index, base_width(self.registry.production),
+                **{k: v for k, v in request.items() if k not in ('area', 'bath', 'bhk', 'location')}
+            )
+        except KeyError as e:
+            self._send(400, {'error': f"Missing or unknown field: {e}"})
+            return
+        except (ValueError, TypeError) as e:
+            self._send(400, {'error': str(e)})
+            return
+
+        response = {'price': float(self.registry.predict_sparse(indices, values))}
+        interval = sparse_prediction_interval(self.registry.production, indices, values)
+        if interval is not None:
+            response['low'], response['high'] = (float(v) for v in interval)
+        self._send(200, response)
+        log_prediction(
+            'server', self.registry, request['location'], request['area'], request['bhk'], request['bath'],
+            response['price'], interval
+        )
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.debug("%s %s", self.address_string(), format % args)
+
+class PreforkServer:
+    """Pool of forked workers accepting on one shared listening socket.
+
+    The model is loaded in the parent before forking, so workers share its
+    pages copy-on-write. On SIGHUP (or with --watch, when the config or the
+    production artifact changes) the parent reloads the model and replaces workers one at a
+    time: each replacement starts before the worker it replaces is told to
+    finish its current request and exit, so the socket is never without
+    acceptors and no connection is dropped.
+    """
+
+    def __init__(self, host, port, workers, config_path=CONFIG_PATH):
+        self.workers = workers
+        self.config_path = config_path
+        self.sock = socket.create_server((host, port), backlog=128)
+        # Every idle worker wakes on a new connection; non-blocking accept
+        # lets the ones that lose the race go back to waiting instead of
+        # blocking until the next connection (workers wait in a selector)
+        self.sock.setblocking(False)
+        self.children = set()
+        self._reload_requested = False
+        self._stopping = False
+        self._load()
+
+    def _load(self):
+        registry = reload_registry(self.config_path)
+        PredictionHandler.registry = registry
+        PredictionHandler.locations = {
+            name: i for i, name in enumerate(model_locations(registry.production))
+        }
+        self._artifact_mtimes = self._mtime()
+
+    def _mtime(self):
+        """Modification times of the config and the production artifact it names"""
+        paths = (self.config_path, PredictionHandler.registry.production_path)
+        return tuple(os.stat(path).st_mtime if os.path.exists(path) else None for path in paths)
+
+    def _spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            self._worker_loop()
+            os._exit(0)
+        self.children.add(pid)
+        return pid
+
+    def _worker_loop(self):
+        stopping = False
+
+        def stop(signum, frame):
+            nonlocal stopping
+            stopping = True
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGHUP, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+        server = HTTPServer(self.sock.getsockname()[:2], PredictionHandler, bind_and_activate=False)
+        server.socket.close()  # unbound socket made by the constructor; the shared one replaces it
+        server.socket = self.sock
+        selector = selectors.DefaultSelector()
+        selector.register(self.sock, selectors.EVENT_READ)
+        while not stopping:
+            # Sleep until a connection arrives, waking every 0.5s to notice SIGTERM
+            if not selector.select(timeout=0.5):
+                continue
+            try:
+                request, address = self.sock.accept()
+            except BlockingIOError:
+                continue  # another worker took it
+            try:
+                server.process_request(request, address)
+            except Exception:
+                server.handle_error(request, address)
+                server.shutdown_request(request)
+        selector.close()
+        close_prediction_log()
+
+    def _reap(self):
+        """Collect exited workers; returns how many exited unexpectedly"""
+        crashed = 0
+        while self.children:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                break
+            if pid in self.children:
+                self.children.discard(pid)
+                crashed += 1
+        return crashed
+
+    def _stop_worker(self, pid):
+        self.children.discard(pid)
+        os.kill(pid, signal.SIGTERM)
+        os.waitpid(pid, 0)
+
+    def roll_workers(self):
+        """Reload the model and replace every worker, one at a time"""
+        try:
+            self._load()
+        except Exception:
+            logger.exception("Model reload failed; keeping current workers")
+            return
+        for pid in list(self.children):
+            self._spawn()
+            self._stop_worker(pid)
+        logger.info("Rolled %d workers onto %s", len(self.children), PredictionHandler.registry.production_path)
+
+    def serve_forever(self, watch=False):
+        signal.signal(signal.SIGHUP, lambda *_: setattr(self, '_reload_requested', True))
+        signal.signal(signal.SIGTERM, lambda *_: setattr(self, '_stopping', True))
+        signal.signal(signal.SIGINT, lambda *_: setattr(self, '_stopping', True))
+
+        for _ in range(self.workers):
+            self._spawn()
+        logger.info("Serving on %s:%d with %d workers", *self.sock.getsockname()[:2], self.workers)
+
+        while not self._stopping:
+            time.sleep(0.5)
+            if watch and self._mtime() != self._artifact_mtimes:
+                self._reload_requested = True
+            if self._reload_requested:
+                self._reload_requested = False
+                self.roll_workers()
+            # Replace workers that died outside a roll
+            for _ in range(self._reap()):
+                self._spawn()
+
+        for pid in list(self.children):
+            self._stop_worker(pid)
+        self.sock.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-core prediction server with graceful model swaps")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8600)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--config', default=CONFIG_PATH, help="models.json naming the production model")
+    parser.add_argument('--watch', action='store_true', help="Roll workers when the config or production model changes")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(process)d %(message)s')
+    PreforkServer(args.host, args.port, args.workers, args.config).serve_forever(args.watch)
+
+if __name__ == "__main__":
+    main()
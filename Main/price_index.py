@@ -0,0 +1,146 @@
+import sys
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+INDEX_PATH = Path(__file__).parent.parent / 'price_per_sqft_index.npz'
+PERCENTILES = (10, 25, 50, 75, 90)
+ALL_BHK = 0  # bhk key used for the all-configurations row of a location
+# Square feet per unit for areas listed in other units ("34.46Sq. Meter")
+SQFT_PER_UNIT = {
+    'sq. meter': 10.7639, 'sq. yards': 9.0, 'perch': 272.25, 'acres': 43560.0,
+    'cents': 435.6, 'guntha': 1089.0, 'grounds': 2400.0,
+}
+
+def parse_total_sqft(values):
+    """Area in sq ft from raw listing values.
+
+    Accepts plain numbers, ranges ("1200 - 1500", taken at the midpoint) and
+    numbers with a unit from SQFT_PER_UNIT; anything else becomes NaN. Only
+    values that aren't plain numbers go through the string parsing.
+    """
+    area = pd.to_numeric(values, errors='coerce')
+    unparsed = area.isna() & values.notna()
+    if unparsed.any():
+        text = values[unparsed].astype(str).str.strip().str.lower()
+        bounds = text.str.extract(r'^([\d.]+)\s*-\s*([\d.]+)$').apply(pd.to_numeric, errors='coerce')
+        amount = text.str.extract(r'^([\d.]+)\s*([a-z. ]+)$')
+        factor = amount[1].str.strip().map(SQFT_PER_UNIT)
+        parsed = bounds.mean(axis=1, skipna=False).fillna(pd.to_numeric(amount[0], errors='coerce') * factor)
+        area = area.astype(float)
+        area[unparsed] = parsed
+    return area
+
+def _map_distinct(values, parse):
+    """Run a column parser over the distinct values only and broadcast back"""
+    codes, uniques = pd.factorize(values)
+    if len(uniques) == 0:  # all missing: codes are all -1 with nothing to index
+        return pd.Series(np.nan, index=values.index)
+    parsed = parse(pd.Series(uniques, dtype=object)).to_numpy()
+    return pd.Series(parsed[codes], index=values.index).where(codes >= 0)
+
+def prepare_listings(listings, required=('location', 'total_sqft', 'bhk', 'price')):
+    """Coerce raw listing columns to numbers and drop unusable rows"""
+    df = listings.copy()
+    if 'bhk' not in df.columns:
+        df['bhk'] = _map_distinct(
+            df['size'], lambda sizes: pd.to_numeric(sizes.str.extract(r'(\d+)', expand=False), errors='coerce')
+        )
+    if 'total_sqft' in df.columns and not pd.api.types.is_numeric_dtype(df['total_sqft']):
+        df['total_sqft'] = _map_distinct(df['total_sqft'], parse_total_sqft)
+    for col in ('total_sqft', 'bhk', 'bath', 'price'):
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    df = df.dropna(subset=list(required))
+    df = df[df['total_sqft'] > 0]
+    df['location'] = _map_distinct(df['location'], lambda names: names.astype(str).str.strip())
+    df['bhk'] = df['bhk'].astype(int)
+    return df
+
+def build_index(listings, min_count=5):
+    """Build per-location and per-(location, BHK) price per sq ft statistics.
+
+    `listings` needs `location`, `total_sqft`, `price` (lakhs) and either a
+    `bhk` column or the raw `size` column ("2 BHK").
+    """
+    df = prepare_listings(listings)
+    df['price_per_sqft'] = df['price'] * 100000 / df['total_sqft']
+
+    # One row per (location, bhk) plus one per location across all configurations
+    per_bhk = df[['location', 'bhk', 'price_per_sqft']]
+    per_location = per_bhk.assign(bhk=ALL_BHK)
+    grouped = pd.concat([per_bhk, per_location]).groupby(['location', 'bhk'])['price_per_sqft']
+
+    stats = grouped.agg(['count', 'mean'])
+    quantiles = grouped.quantile([p / 100 for p in PERCENTILES]).unstack()
+    stats = stats.join(quantiles)
+    stats = stats[stats['count'] >= min_count]
+
+    return {
+        'location': stats.index.get_level_values('location').to_numpy(dtype=str),
+        'bhk': stats.index.get_level_values('bhk').to_numpy(dtype=np.int16),
+        'count': stats['count'].to_numpy(dtype=np.int32),
+        'mean': stats['mean'].to_numpy(dtype=np.float32),
+        'percentiles': stats[quantiles.columns].to_numpy(dtype=np.float32),
+    }
+
+def save_index(index, path=INDEX_PATH):
+    """Store the index as a compressed npz file"""
+    np.savez_compressed(path, **index)
+
+class PricePerSqftIndex:
+    """In-memory price per sq ft index with O(1) lookups by location and BHK"""
+
+    def __init__(self, index):
+        self.count = index['count']
+        self.mean = index['mean']
+        self.percentiles = index['percentiles']
+        self._rows = {
+            (location, int(bhk)): row
+            for row, (location, bhk) in enumerate(zip(index['location'], index['bhk']))
+        }
+
+    def __len__(self):
+        return len(self._rows)
+
+    def lookup(self, location, bhk=ALL_BHK):
+        """Return stats for a location and BHK, falling back to the whole location"""
+        row = self._rows.get((location, int(bhk)))
+        if row is None:
+            row = self._rows.get((location, ALL_BHK))
+        if row is None:
+            return None
+
+        pcts = self.percentiles[row]
+        return {
+            'count': int(self.count[row]),
+            'mean': float(self.mean[row]),
+            'median': float(pcts[PERCENTILES.index(50)]),
+            'percentiles': dict(zip(PERCENTILES, pcts.tolist())),
+        }
+
+def load_index(path=INDEX_PATH):
+    """Load a saved index, or None if it hasn't been built yet"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with np.load(path) as data:
+        return PricePerSqftIndex({key: data[key] for key in data.files})
+
+def percentile_rank(stats, price_per_sqft):
+    """Approximate percentile of a price per sq ft within a location's distribution.
+
+    Values outside the stored range are clamped to the lowest/highest percentile.
+    """
+    points = list(stats['percentiles'].values())
+    return float(np.interp(price_per_sqft, points, PERCENTILES))
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python price_index.py <listings.csv> [output.npz]")
+        sys.exit(1)
+
+    output = sys.argv[2] if len(sys.argv) > 2 else INDEX_PATH
+    index = build_index(pd.read_csv(sys.argv[1]))
+    save_index(index, output)
+    print(f"Indexed {len(index['location'])} location/BHK groups to {output}")
@@ -0,0 +1,142 @@
+import logging
+import numpy as np
+from scipy import stats
+from property_features import base_width
+
+# Feature layout expected by the model: [area, bath, bhk, location_0, location_1, ...]
+AREA, BATH, BHK = 0, 1, 2
+LOCATION_OFFSET = 3
+
+# float32 scoring is only allowed when it stays this close (lakhs, i.e. ₹1,000)
+# to float64 across every location and the check grid below
+FLOAT32_MAX_ERROR = 0.01
+CHECK_AREAS = np.linspace(300, 10000, 98)
+CHECK_CONFIGURATIONS = tuple((bhk, bath) for bhk in range(1, 7) for bath in range(1, bhk + 3))
+
+logger = logging.getLogger('pricegenie.model')
+
+def _coefficients(model, dtype):
+    return np.asarray(model.coef_, dtype=dtype), dtype(model.intercept_)
+
+def base_prices(model, loc_indices, bhk, bath, dtype=np.float64):
+    """Predicted price at zero area for each location, i.e. everything but the area term"""
+    coef, intercept = _coefficients(model, dtype)
+    loc_indices = np.asarray(loc_indices)
+    return intercept + coef[BATH] * dtype(bath) + coef[BHK] * dtype(bhk) + coef[LOCATION_OFFSET + loc_indices]
+
+def price_curves(model, loc_indices, areas, bhk, bath, dtype=np.float64):
+    """Predict prices for every (location, area) pair in one matrix evaluation.
+
+    The model is linear, so each location's curve is its location coefficient
+    plus the shared bath/bhk terms, offset by the area slope. Returns an array
+    of shape (len(loc_indices), len(areas)) in lakhs.
+    """
+    areas = np.asarray(areas, dtype=dtype)
+    base = base_prices(model, loc_indices, bhk, bath, dtype)
+    return base[:, None] + dtype(model.coef_[AREA]) * areas[None, :]
+
+def max_affordable_area(model, loc_indices, budget, bhk, bath):
+    """Largest area (sq ft) affordable in each location for a budget in lakhs.
+
+    Solves budget = base + slope * area for every location at once. Locations
+    where even a zero-area property exceeds the budget get NaN.
+    """
+    base = base_prices(model, loc_indices, bhk, bath)
+    area = (budget - base) / model.coef_[AREA]
+    return np.where(area > 0, area, np.nan)
+
+def sparse_predict(model, indices, values):
+    """Score a sparse feature vector in O(nonzeros).
+
+    Columns beyond the model's width are dropped, so a base model simply
+    ignores extended property attributes.
+    """
+    indices, values = _within(model, indices, values)
+    return model.intercept_ + model.coef_[indices] @ values
+
+def _within(model, indices, values):
+    indices = np.asarray(indices)
+    values = np.asarray(values, dtype=float)
+    keep = indices < model.n_features_in_
+    return indices[keep], values[keep]
+
+def prediction_interval(model, x, level=0.95):
+    """Prediction interval (low, high) in lakhs for one dense feature vector"""
+    x = np.asarray(x, dtype=float)
+    nonzero = np.flatnonzero(x)
+    return sparse_prediction_interval(model, nonzero, x[nonzero], level)
+
+def sparse_prediction_interval(model, indices, values, level=0.95):
+    """Prediction interval (low, high) in lakhs for a sparse feature vector.
+
+    Uses the covariance stored with retrained models and only touches the
+    rows/columns of the nonzero features, so the cost doesn't grow with the
+    number of locations. Returns None for models saved without one.
+    """
+    covariance = getattr(model, 'covariance_', None)
+    if covariance is None:
+        return None
+
+    indices, values = _within(model, indices, values)
+    rows = np.concatenate([[0], indices + 1])  # row 0 is the intercept
+    z = np.concatenate([[1.0], values])
+    leverage = z @ covariance[np.ix_(rows, rows)] @ z
+
+    prediction = model.intercept_ + model.coef_[indices] @ values
+    margin = stats.t.ppf((1 + level) / 2, model.dof_) * np.sqrt(model.sigma2_ * (1 + leverage))
+    return prediction - margin, prediction + margin
+
+def batch_predict(model, areas, baths, bhks, loc_indices, dtype=np.float64):
+    """Base-feature predictions for many properties at once.
+
+    A location index of -1 marks a location with no model column; it gets no
+    location term, i.e. the model's baseline location. Pass the dtype from
+    `scoring_dtype` to score in float32.
+    """
+    coef, intercept = _coefficients(model, dtype)
+    loc_indices = np.asarray(loc_indices)
+    location_terms = np.where(loc_indices >= 0, coef[LOCATION_OFFSET + np.maximum(loc_indices, 0)], dtype(0))
+    return (intercept + coef[AREA] * np.asarray(areas, dtype=dtype)
+            + coef[BATH] * np.asarray(baths, dtype=dtype) + coef[BHK] * np.asarray(bhks, dtype=dtype)
+            + location_terms)
+
+def affordable_areas(model, loc_indices, budgets, bhks, baths, dtype=np.float64):
+    """Largest affordable area for every (budget, configuration, location).
+
+    `bhks` and `baths` pair up into configurations. Returns an array of
+    shape (len(budgets), len(bhks), len(loc_indices)) in sq ft, NaN where
+    even a zero-area property is over budget.
+    """
+    budgets = np.asarray(budgets, dtype=dtype)
+    base = np.stack([base_prices(model, loc_indices, bhk, bath, dtype) for bhk, bath in zip(bhks, baths)])
+    area = (budgets[:, None, None] - base[None, :, :]) / dtype(model.coef_[AREA])
+    return np.where(area > 0, area, dtype(np.nan))
+
+def float32_error(model, areas=CHECK_AREAS, configurations=CHECK_CONFIGURATIONS):
+    """Largest absolute difference (lakhs) between float32 and float64 prices.
+
+    Compares the price surfaces of every model location over a grid of
+    areas and (bhk, bath) configurations.
+    """
+    loc_indices = np.arange(base_width(model) - LOCATION_OFFSET)
+    error = 0.0
+    for bhk, bath in configurations:
+        reference = price_curves(model, loc_indices, areas, bhk, bath)
+        reduced = price_curves(model, loc_indices, areas, bhk, bath, dtype=np.float32)
+        error = max(error, float(np.abs(reduced - reference).max()))
+    return error
+
+def scoring_dtype(model, float32=False, max_error=FLOAT32_MAX_ERROR):
+    """dtype to score a model in: float32 only if requested and accurate enough.
+
+    float32 halves the memory and bandwidth of batch and price-surface
+    arrays, but a model whose coefficients lose too much precision falls
+    back to float64 with a warning instead.
+    """
+    if not float32:
+        return np.float64
+    error = float32_error(model)
+    if not error <= max_error:
+        logger.warning("float32 scoring refused: error %.4g lakhs exceeds %.4g; using float64", error, max_error)
+        return np.float64
+    return np.float32
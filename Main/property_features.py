@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Property attributes collected on the Price Prediction page. Extended models
+# append these columns after the base [area, bath, bhk, location_*] layout,
+# so base columns keep the same indices in both kinds of model.
+NUMERIC = ['property_age', 'floor_num', 'total_floors']
+FURNISHING = ["Unfurnished", "Semi-furnished", "Fully Furnished"]
+FACING = ["North", "South", "East", "West", "North East", "North West", "South East", "South West"]
+AMENITIES = ["Metro Station", "Bus Stop", "School", "Hospital", "Shopping Mall", "Park"]
+
+ATTRIBUTE_NAMES = (
+    NUMERIC
+    + [f'furnishing_{v}' for v in FURNISHING]
+    + ['parking']
+    + [f'facing_{v}' for v in FACING]
+    + [f'amenity_{v}' for v in AMENITIES]
+)
+_FURNISHING_OFFSET = len(NUMERIC)
+_PARKING_OFFSET = _FURNISHING_OFFSET + len(FURNISHING)
+_FACING_OFFSET = _PARKING_OFFSET + 1
+_AMENITY_OFFSET = _FACING_OFFSET + len(FACING)
+
+def extended_feature_names(base_names):
+    """Column layout of an extended model built on a base layout"""
+    return list(base_names) + ATTRIBUTE_NAMES
+
+def has_attributes(model):
+    """Whether a model was trained on the extended layout"""
+    names = list(getattr(model, 'feature_names_in_', []))
+    return names[-len(ATTRIBUTE_NAMES):] == ATTRIBUTE_NAMES
+
+def base_width(model):
+    """Number of base [area, bath, bhk, location_*] columns in a model"""
+    n = model.n_features_in_
+    return n - len(ATTRIBUTE_NAMES) if has_attributes(model) else n
+
+def encode_property(area, bath, bhk, loc_index, n_base, property_age=0, floor_num=0,
+                    total_floors=0, furnishing=None, parking=None, facing=None, amenities=()):
+    """Encode one property as sparse (indices, values) in the extended layout.
+
+    `n_base` is the width of the base layout (3 + number of locations).
+    Only nonzero entries are produced, a dozen or so at most.
+    """
+    indices = [0, 1, 2, 3 + loc_index]
+    values = [area, bath, bhk, 1.0]
+
+    for i, value in enumerate((property_age, floor_num, total_floors)):
+        if value:
+            indices.append(n_base + i)
+            values.append(value)
+    if furnishing in FURNISHING:
+        indices.append(n_base + _FURNISHING_OFFSET + FURNISHING.index(furnishing))
+        values.append(1.0)
+    if parking == "Yes":
+        indices.append(n_base + _PARKING_OFFSET)
+        values.append(1.0)
+    if facing in FACING:
+        indices.append(n_base + _FACING_OFFSET + FACING.index(facing))
+        values.append(1.0)
+    for amenity in amenities:
+        if amenity in AMENITIES:
+            indices.append(n_base + _AMENITY_OFFSET + AMENITIES.index(amenity))
+            values.append(1.0)
+
+    return np.array(indices), np.array(values, dtype=float)
+
+def encode_attributes(df):
+    """Encode listing attribute columns as a sparse (rows x attributes) matrix.
+
+    Missing columns are treated as absent attributes. `amenities` is a
+    semicolon-separated list per row.
+    """
+    n = len(df)
+    rows, cols, vals = [], [], []
+
+    def add(row_idx, col_idx, values):
+        rows.append(np.asarray(row_idx))
+        cols.append(np.asarray(col_idx))
+        vals.append(np.asarray(values, dtype=float))
+
+    positions = np.arange(n)
+    for i, name in enumerate(NUMERIC):
+        if name in df.columns:
+            values = pd.to_numeric(df[name], errors='coerce').fillna(0).to_numpy()
+            add(positions, np.full(n, i), values)
+
+    for name, options, offset in (('furnishing', FURNISHING, _FURNISHING_OFFSET),
+                                  ('facing', FACING, _FACING_OFFSET)):
+        if name in df.columns:
+            codes = df[name].map({v: j for j, v in enumerate(options)}).to_numpy(dtype=float)
+            known = ~np.isnan(codes)
+            add(positions[known], offset + codes[known].astype(int), np.ones(known.sum()))
+
+    if 'parking' in df.columns:
+        has_parking = (df['parking'] == "Yes").to_numpy()
+        add(positions[has_parking], np.full(has_parking.sum(), _PARKING_OFFSET), np.ones(has_parking.sum()))
+
+    if 'amenities' in df.columns:
+        lists = df['amenities'].fillna('').astype(str).str.split(';')
+        row_idx = np.repeat(positions, lists.str.len().to_numpy())
+        codes = lists.explode().str.strip().map({v: j for j, v in enumerate(AMENITIES)}).to_numpy(dtype=float)
+        known = ~np.isnan(codes)
+        add(row_idx[known], _AMENITY_OFFSET + codes[known].astype(int), np.ones(known.sum()))
+
+    if not rows:
+        return sparse.csr_matrix((n, len(ATTRIBUTE_NAMES)))
+    return sparse.csr_matrix(
+        (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(n, len(ATTRIBUTE_NAMES))
+    )
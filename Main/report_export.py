@@ -0,0 +1,227 @@
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from openpyxl import Workbook
+from locality_search import model_locations, normalize
+from model_registry import CONFIG_PATH, get_registry
+from prediction_log import get_prediction_log
+from price_model import batch_predict, scoring_dtype
+from finance import emi, roi, rental_yield
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = pq = None
+
+CHUNK_ROWS = 10000
+REPORT_PREFIX = 'pricegenie-report-'
+REPORT_MAX_AGE = 3600  # seconds before an undownloaded report file is removed
+REQUIRED = ('location', 'total_sqft', 'bhk', 'bath')
+
+# Format name -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    'CSV': ('csv', 'text/csv'),
+    'Excel': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
+if pq is not None:
+    EXPORT_FORMATS['Parquet'] = ('parquet', 'application/vnd.apache.parquet')
+
+def read_portfolio(source, chunksize=CHUNK_ROWS):
+    """Yield portfolio rows in chunks from a CSV, or an Excel file split into chunks"""
+    name = str(getattr(source, 'name', source)).lower()
+    if name.endswith(('.xlsx', '.xls')):
+        df = pd.read_excel(source)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize]
+    else:
+        yield from pd.read_csv(source, chunksize=chunksize)
+
+class PortfolioScorer:
+    """Scores portfolio chunks: predicted value, loan EMI and investment returns.
+
+    Each chunk is scored with whole-column operations. Optional
+    `purchase_price` (₹) and `monthly_rent` (₹) columns feed ROI and rental
+    yield; without a purchase price the predicted value is used. Rows whose
+    location the model doesn't know get no predicted price, and so no loan
+    figures either, rather than the baseline location's price. With
+    `float32` the predictions are computed in float32 if the model passes
+    the accuracy check in `scoring_dtype`.
+    """
+
+    def __init__(self, model, rate=8.5, tenure=20, down_payment=20, years=5, model_name='', float32=False):
+        self.model = model
+        self.dtype = scoring_dtype(model, float32)
+        self.model_name = model_name
+        self.rate = rate
+        self.tenure = tenure
+        self.down_payment = down_payment
+        self.years = years
+        self._locations = {normalize(name): i for i, name in enumerate(model_locations(model))}
+
+    def score(self, chunk):
+        missing = [col for col in REQUIRED if col not in chunk.columns]
+        if missing:
+            raise ValueError(f"Portfolio is missing columns: {', '.join(missing)}")
+
+        df = chunk.reset_index(drop=True)
+        # Always float64, so a chunk with a blank cell has the same column
+        # types as one without (Parquet fixes the schema at the first chunk)
+        for col in ('total_sqft', 'bhk', 'bath', 'purchase_price', 'monthly_rent'):
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors='coerce').astype(np.float64)
+        loc_indices = df['location'].astype(str).map(normalize).map(self._locations)
+
+        out = pd.DataFrame({
+            'location': df['location'],
+            'total_sqft': df['total_sqft'],
+            'bhk': df['bhk'],
+            'bath': df['bath'],
+            'known_location': loc_indices.notna(),
+        })
+        price = batch_predict(
+            self.model, df['total_sqft'], df['bath'], df['bhk'],
+            loc_indices.fillna(-1).to_numpy(dtype=np.int64), self.dtype
+        )
+        # Unknown locations would otherwise be priced as the baseline location
+        price = np.where(out['known_location'], price, np.nan)
+        value = price * 100000
+        out['predicted_price_lakhs'] = price
+        out['price_per_sqft'] = value / df['total_sqft']
+
+        loan = value * (1 - self.down_payment / 100)
+        out['loan_amount'] = loan
+        out['monthly_emi'] = emi(loan, self.rate, self.tenure)
+        out['total_interest'] = out['monthly_emi'] * self.tenure * 12 - loan
+
+        purchase = df['purchase_price'] if 'purchase_price' in df.columns else value
+        rent = df['monthly_rent'].fillna(0) if 'monthly_rent' in df.columns else 0.0
+        out['purchase_price'] = purchase
+        out['monthly_rent'] = rent
+        out['roi_pct'] = roi(purchase, value, rent, self.years)
+        out['rental_yield_pct'] = rental_yield(purchase, rent)
+        return out
+
+    def score_chunks(self, chunks):
+        log = get_prediction_log()
+        for chunk in chunks:
+            scored = self.score(chunk)
+            log.record_batch('batch', self.model_name, scored.rename(columns={
+                'total_sqft': 'area', 'predicted_price_lakhs': 'price'
+            }))
+            yield scored
+
+def _write_csv(chunks, path):
+    with open(path, 'w', newline='') as f:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(f, header=i == 0, index=False)
+
+def _write_excel(chunks, path):
+    # Write-only workbooks stream rows to disk instead of keeping cells in memory
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Portfolio')
+    for i, chunk in enumerate(chunks):
+        if i == 0:
+            sheet.append(list(chunk.columns))
+        for row in chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None):
+            sheet.append(row)
+    workbook.save(path)
+
+def _write_parquet(chunks, path):
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table.cast(writer.schema))  # one row group per chunk
+    finally:
+        if writer is not None:
+            writer.close()
+
+WRITERS = {'CSV': _write_csv, 'Excel': _write_excel, 'Parquet': _write_parquet}
+
+def export_report(chunks, fmt, path=None):
+    """Write scored chunks to a file as they are produced; returns (path, rows).
+
+    Only one chunk is held in memory at a time. Without a path the report
+    goes to a temporary file, which is removed if the export fails and
+    otherwise left for the caller (see `take_report`); ones never collected
+    are swept up by a later export once REPORT_MAX_AGE old.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    temporary = path is None
+    if temporary:
+        sweep_reports()
+        fd, path = tempfile.mkstemp(suffix='.' + EXPORT_FORMATS[fmt][0], prefix=REPORT_PREFIX)
+        os.close(fd)
+
+    rows = 0
+    def counted(chunks):
+        nonlocal rows
+        for chunk in chunks:
+            rows += len(chunk)
+            yield chunk
+
+    try:
+        WRITERS[fmt](counted(chunks), path)
+    except BaseException:
+        if temporary:
+            Path(path).unlink(missing_ok=True)
+        raise
+    return path, rows
+
+def take_report(path):
+    """Contents of a finished report file, which is deleted once read"""
+    path = Path(path)
+    try:
+        return path.read_bytes()
+    finally:
+        path.unlink(missing_ok=True)
+
+def discard_report(path):
+    """Delete a report file that will no longer be downloaded"""
+    Path(path).unlink(missing_ok=True)
+
+def sweep_reports(max_age=REPORT_MAX_AGE):
+    """Delete temporary report files older than max_age seconds; returns how many"""
+    cutoff = time.time() - max_age
+    removed = 0
+    for path in Path(tempfile.gettempdir()).glob(REPORT_PREFIX + '*'):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            continue  # taken or removed by another session meanwhile
+    return removed
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a portfolio file and export the report")
+    parser.add_argument('portfolio', help="CSV or Excel file with location, total_sqft, bhk and bath columns")
+    parser.add_argument('output')
+    parser.add_argument('--format', choices=list(EXPORT_FORMATS), default='CSV')
+    parser.add_argument('--config', default=CONFIG_PATH, help="models.json naming the production model")
+    parser.add_argument('--rate', type=float, default=8.5, help="Loan interest rate (%%)")
+    parser.add_argument('--tenure', type=int, default=20, help="Loan tenure (years)")
+    parser.add_argument('--down-payment', type=float, default=20, help="Down payment (%%)")
+    parser.add_argument('--years', type=int, default=5, help="Holding period for ROI (years)")
+    parser.add_argument('--float32', action='store_true',
+                        help="Score in float32 when the model stays within FLOAT32_MAX_ERROR of float64")
+    args = parser.parse_args()
+
+    registry = get_registry(args.config)
+    scorer = PortfolioScorer(registry.production, args.rate, args.tenure, args.down_payment, args.years,
+                             model_name=Path(registry.production_path).name, float32=args.float32)
+
+    start = time.perf_counter()
+    _, rows = export_report(scorer.score_chunks(read_portfolio(args.portfolio)), args.format, args.output)
+    print(f"Exported {rows} rows to {args.output} in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import numpy as np
+from pathlib import Path
+from sklearn.linear_model import LinearRegression
+from price_index import INDEX_PATH, PricePerSqftIndex
+
+TABLES_PATH = Path(os.environ.get('PRICEGENIE_SHARED_TABLES', Path(__file__).parent.parent / 'shared_tables'))
+MODEL_PATH = Path(__file__).parent.parent / 'banglore_home_prices_model.pickle'
+
+# Optional model arrays carried over when present (see train_model.py)
+MODEL_ARRAYS = ('coef_', 'covariance_')
+INDEX_ARRAYS = ('location', 'bhk', 'count', 'mean', 'percentiles')
+
+def publish_tables(model, price_index=None, path=TABLES_PATH):
+    """Write model coefficients and lookup tables as .npy files for mmap.
+
+    Each publish goes to a fresh directory and `path` is a symlink swapped
+    over to it atomically, so attaching processes never see a half-written
+    set. Processes still mapping the previous files keep valid mappings.
+    The generation just replaced is kept until the next publish, since a
+    process may be attaching to it right now; older ones are removed.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=path.name + '.', dir=path.parent))
+
+    meta = {
+        'intercept_': float(model.intercept_),
+        'feature_names_in_': [str(name) for name in model.feature_names_in_],
+    }
+    for name in ('sigma2_', 'dof_'):
+        if hasattr(model, name):
+            meta[name] = float(getattr(model, name))
+    for name in MODEL_ARRAYS:
+        if getattr(model, name, None) is not None:
+            np.save(staging / f'model{name}.npy', np.ascontiguousarray(getattr(model, name)))
+
+    if price_index is not None:
+        for name in INDEX_ARRAYS:
+            np.save(staging / f'index_{name}.npy', price_index[name])
+
+    with open(staging / 'meta.json', 'w') as f:
+        json.dump(meta, f)
+
+    previous = path.resolve() if path.is_symlink() else None
+    link = path.with_name(path.name + '.swap')
+    if link.is_symlink():
+        link.unlink()
+    link.symlink_to(staging.name)
+    os.replace(link, path)
+    keep = {staging.resolve(), previous}
+    for old in path.parent.glob(path.name + '.*'):
+        if old.is_dir() and not old.is_symlink() and old.resolve() not in keep:
+            shutil.rmtree(old, ignore_errors=True)
+
+def _attach(path, name):
+    return np.load(Path(path) / name, mmap_mode='r')
+
+def attach_model(path=TABLES_PATH):
+    """LinearRegression whose coefficient arrays are read-only views of the shared files"""
+    # Resolve the link once so metadata and arrays come from one generation
+    path = Path(path).resolve()
+    with open(path / 'meta.json') as f:
+        meta = json.load(f)
+
+    model = LinearRegression()
+    model.intercept_ = meta['intercept_']
+    model.feature_names_in_ = np.array(meta['feature_names_in_'], dtype=object)
+    model.n_features_in_ = len(meta['feature_names_in_'])
+    for name in ('sigma2_', 'dof_'):
+        if name in meta:
+            setattr(model, name, meta[name])
+    for name in MODEL_ARRAYS:
+        if (path / f'model{name}.npy').exists():
+            setattr(model, name, _attach(path, f'model{name}.npy'))
+    return model
+
+def attach_price_index(path=TABLES_PATH):
+    """Price per sq ft index over the shared arrays, or None if not published"""
+    path = Path(path).resolve()
+    if not (Path(path) / 'index_location.npy').exists():
+        return None
+    return PricePerSqftIndex({name: _attach(path, f'index_{name}.npy') for name in INDEX_ARRAYS})
+
+def is_shared_tables(path):
+    return (Path(path) / 'meta.json').exists()
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish the model and lookup tables for zero-copy sharing")
+    parser.add_argument('--model', default=MODEL_PATH, help="Model pickle to publish")
+    parser.add_argument('--index', default=INDEX_PATH, help="Price per sq ft index (.npz) to publish")
+    parser.add_argument('--output', default=TABLES_PATH, help="Directory the workers attach to")
+    args = parser.parse_args()
+
+    with open(args.model, 'rb') as f:
+        model = pickle.load(f)
+    price_index = None
+    if Path(args.index).exists():
+        with np.load(args.index) as data:
+            price_index = {name: data[name] for name in INDEX_ARRAYS}
+    publish_tables(model, price_index, args.output)
+    print(f"Published shared tables to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+import argparse
+import os
+import pickle
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from scipy import sparse
+from sklearn.linear_model import LinearRegression
+from listing_cleaning import clean_listings, dataset_moments
+from price_index import prepare_listings
+from property_features import base_width, encode_attributes, extended_feature_names
+
+MODEL_PATH = Path(__file__).parent.parent / 'banglore_home_prices_model.pickle'
+BASE_FEATURES = ['total_sqft', 'bath', 'bhk']
+REQUIRED = ('location', 'total_sqft', 'bath', 'bhk', 'price')
+
+def load_feature_names(model_path=MODEL_PATH):
+    """Base column layout of an existing model: base features followed by locations"""
+    with open(model_path, 'rb') as f:
+        model = pickle.load(f)
+    return list(model.feature_names_in_[:base_width(model)])
+
+class NormalEquations:
+    """Sufficient statistics X^T X, X^T y for a linear model with one-hot locations.
+
+    The design matrix is [1, area, bath, bhk, location_*]. Each row has a
+    single location, so the location block of X^T X is diagonal and the
+    cross terms are per-location sums; a chunk is accumulated in O(rows)
+    without materialising the one-hot columns.
+    """
+
+    def __init__(self, feature_names):
+        self.feature_names = list(feature_names)
+        self.locations = self.feature_names[len(BASE_FEATURES):]
+        self._loc_index = {name: i for i, name in enumerate(self.locations)}
+        size = 1 + len(self.feature_names)  # leading intercept column
+        self.xtx = np.zeros((size, size))
+        self.xty = np.zeros(size)
+        self.yty = 0.0
+        self.n = 0
+
+    def update(self, chunk):
+        """Accumulate a chunk of raw listings; returns the number of rows used"""
+        df = prepare_listings(chunk, required=REQUIRED)
+        if len(df) == 0:
+            return 0
+
+        dense = np.column_stack([np.ones(len(df)), df[BASE_FEATURES].to_numpy(dtype=np.float64)])
+        y = df['price'].to_numpy(dtype=np.float64)
+        loc = df['location'].map(self._loc_index).fillna(-1).to_numpy(dtype=np.int64)
+
+        d = dense.shape[1]
+        self.xtx[:d, :d] += dense.T @ dense
+        self.xty[:d] += dense.T @ y
+        self.yty += float(y @ y)
+        self.n += len(df)
+
+        # Locations outside the vocabulary are the all-zeros baseline
+        known = loc >= 0
+        loc, dense, y = loc[known], dense[known], y[known]
+        n_loc = len(self.locations)
+        counts = np.bincount(loc, minlength=n_loc)
+        cross = np.column_stack([
+            np.bincount(loc, weights=dense[:, j], minlength=n_loc) for j in range(d)
+        ])
+        self.xtx[:d, d:] += cross.T
+        self.xtx[d:, :d] += cross
+        self.xtx[np.arange(d, d + n_loc), np.arange(d, d + n_loc)] += counts
+        self.xty[d:] += np.bincount(loc, weights=y, minlength=n_loc)
+        return len(df)
+
+    def merge(self, other):
+        """Add another accumulator's statistics into this one"""
+        if other.feature_names != self.feature_names:
+            raise ValueError("Cannot merge statistics with different feature layouts")
+        self.xtx += other.xtx
+        self.xty += other.xty
+        self.yty += other.yty
+        self.n += other.n
+        return self
+
+    def solve(self, alpha=0.0):
+        """Least-squares coefficients; returns (intercept, coef).
+
+        A positive `alpha` adds a ridge penalty on everything but the
+        intercept. The penalty is applied to the merged statistics, so it
+        gives the same answer however the data was sharded.
+        """
+        beta = np.linalg.lstsq(self._penalised(alpha), self.xty, rcond=None)[0]
+        return beta[0], beta[1:]
+
+    def _penalised(self, alpha):
+        xtx = self.xtx.copy()
+        penalised = np.arange(1, len(xtx))
+        xtx[penalised, penalised] += alpha
+        return xtx
+
+    def uncertainty(self, intercept, coef, alpha=0.0):
+        """Coefficient covariance (up to sigma^2) and residual variance for intervals.
+
+        Returns (covariance, sigma2, dof). With A = X^T X + alpha*I the ridge
+        coefficients have covariance sigma^2 A^-1 X^T X A^-1, which is
+        (X^T X)^-1 when alpha is 0; dof is n less the effective number of
+        parameters, trace(A^-1 X^T X). The residual sum of squares comes
+        from the accumulated statistics, so no second pass over the data.
+        """
+        beta = np.concatenate([[intercept], coef])
+        inverse = np.linalg.pinv(self._penalised(alpha), hermitian=True)
+        hat = inverse @ self.xtx
+        covariance = hat @ inverse
+        covariance = (covariance + covariance.T) / 2  # symmetric up to rounding
+        if alpha:
+            parameters = np.trace(hat)
+        else:
+            parameters = np.linalg.matrix_rank(self.xtx, hermitian=True)
+        rss = self.yty - 2 * beta @ self.xty + beta @ self.xtx @ beta
+        dof = max(self.n - parameters, 1)
+        return covariance, max(rss, 0.0) / dof, dof
+
+    def to_model(self, alpha=0.0):
+        """Fit and wrap the result in a LinearRegression the predictors can load.
+
+        The model also carries `covariance_` (coefficient covariance over
+        sigma^2, with the intercept as row/column 0), `sigma2_` and `dof_` for
+        intervals.
+        """
+        intercept, coef = self.solve(alpha)
+        model = LinearRegression()
+        model.coef_ = coef
+        model.intercept_ = intercept
+        model.feature_names_in_ = np.array(self.feature_names, dtype=object)
+        model.n_features_in_ = len(self.feature_names)
+        model.covariance_, model.sigma2_, model.dof_ = self.uncertainty(intercept, coef, alpha)
+        return model
+
+class ExtendedNormalEquations(NormalEquations):
+    """Sufficient statistics for the extended layout with property attributes.
+
+    Rows carry a handful of attribute columns besides the location, so each
+    chunk is encoded as a sparse matrix and X^T X is accumulated from it.
+    """
+
+    def __init__(self, base_names):
+        super().__init__(extended_feature_names(base_names))
+        self.locations = list(base_names)[len(BASE_FEATURES):]
+        self._loc_index = {name: i for i, name in enumerate(self.locations)}
+
+    def update(self, chunk):
+        df = prepare_listings(chunk, required=REQUIRED)
+        n = len(df)
+        if n == 0:
+            return 0
+
+        dense = np.column_stack([np.ones(n), df[BASE_FEATURES].to_numpy(dtype=np.float64)])
+        loc = df['location'].map(self._loc_index).fillna(-1).to_numpy(dtype=np.int64)
+        known = loc >= 0
+        one_hot = sparse.csr_matrix(
+            (np.ones(known.sum()), (np.flatnonzero(known), loc[known])),
+            shape=(n, len(self.locations))
+        )
+        X = sparse.hstack([sparse.csr_matrix(dense), one_hot, encode_attributes(df)], format='csr')
+        y = df['price'].to_numpy(dtype=np.float64)
+
+        self.xtx += (X.T @ X).toarray()
+        self.xty += X.T @ y
+        self.yty += float(y @ y)
+        self.n += n
+        return n
+
+def accumulate(paths, feature_names, chunksize=100000, extended=False, moments=None):
+    """Stream CSV files through a NormalEquations accumulator.
+
+    With location `moments` (see listing_cleaning.dataset_moments) each
+    chunk is cleaned before it is accumulated.
+    """
+    stats = ExtendedNormalEquations(feature_names) if extended else NormalEquations(feature_names)
+    for path in paths:
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            if moments is not None:
+                chunk = clean_listings(chunk, moments)
+            stats.update(chunk)
+    return stats
+
+def _accumulate_file(path, feature_names, chunksize, extended, moments):
+    """Worker task: statistics for one file plus the seconds spent on it"""
+    start = time.perf_counter()
+    stats = accumulate([path], feature_names, chunksize, extended, moments)
+    return stats, time.perf_counter() - start
+
+def accumulate_parallel(paths, feature_names, chunksize=100000, workers=None, extended=False, moments=None):
+    """Shard files across a process pool and merge the partial statistics.
+
+    Returns the merged statistics and a throughput report with overall and
+    per-core rows/sec.
+    """
+    workers = workers or os.cpu_count() or 1
+    stats = ExtendedNormalEquations(feature_names) if extended else NormalEquations(feature_names)
+    busy = 0.0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        tasks = [
+            pool.submit(_accumulate_file, path, feature_names, chunksize, extended, moments) for path in paths
+        ]
+        for task in tasks:
+            partial, seconds = task.result()
+            stats.merge(partial)
+            busy += seconds
+    wall = time.perf_counter() - start
+
+    report = {
+        'rows': stats.n,
+        'workers': workers,
+        'wall_seconds': wall,
+        'rows_per_sec': stats.n / wall if wall else 0.0,
+        'rows_per_sec_per_core': stats.n / busy if busy else 0.0,
+    }
+    return stats, report
+
+def save_model(model, path=MODEL_PATH):
+    with open(path, 'wb') as f:
+        pickle.dump(model, f)
+
+def main():
+    parser = argparse.ArgumentParser(description="Retrain the house price model from raw listings")
+    parser.add_argument('data', nargs='+', help="Listing CSV files")
+    parser.add_argument('--output', default=MODEL_PATH, help="Where to write the model pickle")
+    parser.add_argument('--layout', default=MODEL_PATH, help="Model whose column layout to reuse")
+    parser.add_argument('--chunksize', type=int, default=100000)
+    parser.add_argument('--workers', type=int, default=1, help="Processes to shard input files across")
+    parser.add_argument('--extended', action='store_true',
+                        help="Also fit property attributes (age, floors, furnishing, parking, facing, amenities)")
+    parser.add_argument('--alpha', type=float, default=0.0, help="Ridge penalty (0 for plain least squares)")
+    parser.add_argument('--clean', action='store_true',
+                        help="Drop implausible listings and per-location price outliers first (extra pass)")
+    args = parser.parse_args()
+
+    feature_names = load_feature_names(args.layout)
+    moments = dataset_moments(args.data, args.chunksize) if args.clean else None
+    if args.workers > 1 and len(args.data) > 1:
+        stats, report = accumulate_parallel(
+            args.data, feature_names, args.chunksize, args.workers, args.extended, moments
+        )
+        print(f"Processed {report['rows']} rows in {report['wall_seconds']:.1f}s "
+              f"({report['rows_per_sec']:,.0f} rows/sec, "
+              f"{report['rows_per_sec_per_core']:,.0f} rows/sec per core on {report['workers']} workers)")
+    else:
+        stats = accumulate(args.data, feature_names, args.chunksize, args.extended, moments)
+    if stats.n == 0:
+        parser.error("No usable rows in the input data")
+    save_model(stats.to_model(args.alpha), args.output)
+    print(f"Trained on {stats.n} rows, saved model to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from comparables import load_comparables
+from geo_index import load_geo_index
+from locality_search import model_locations, search_index
+from model_registry import get_registry
+from prediction_log import get_prediction_log
+from price_index import load_index
+from property_features import base_width, encode_property
+from shared_tables import attach_price_index
+
+HOME = Path(__file__).parent / 'Home.py'
+READY_HOST = os.environ.get('PRICEGENIE_READY_HOST', '127.0.0.1')
+READY_PORT = int(os.environ.get('PRICEGENIE_READY_PORT', 8599))
+
+logger = logging.getLogger('pricegenie.warmup')
+
+@lru_cache(maxsize=None)
+def price_index():
+    """Price per sq ft index, loaded once per process; prefers the shared, memory-mapped copy"""
+    return attach_price_index() or load_index()
+
+@lru_cache(maxsize=None)
+def comparables_index():
+    """Memory-mapped comparable listings index, opened once per process"""
+    return load_comparables()
+
+@lru_cache(maxsize=None)
+def geo_index():
+    """Saved neighbourhood geo index, loaded once per process (None if not built)"""
+    return load_geo_index()
+
+@lru_cache(maxsize=None)
+def precompute_pool():
+    """Background threads the pages hand precomputation to, created once per process"""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix='precompute')
+
+def _warm_imports():
+    # Libraries the pages pull in on first visit
+    import plotly.express
+    import plotly.graph_objects
+    import scipy.stats
+    import sklearn.linear_model
+
+def _warm_model():
+    registry = get_registry()
+    model = registry.production
+    search_index(tuple(model_locations(model)))
+    # One prediction so the first user's request doesn't pay for first-call setup
+    registry.predict_sparse(*encode_property(1000.0, 2.0, 2.0, 0, base_width(model)))
+
+STEPS = (
+    ('imports', _warm_imports),
+    ('model', _warm_model),
+    ('price_index', price_index),
+    ('comparables', comparables_index),
+    ('geo_index', geo_index),
+    ('prediction_log', get_prediction_log),
+)
+
+_state = {'status': 'cold', 'pid': os.getpid(), 'steps': {}, 'error': None, 'seconds': None}
+_state_lock = threading.Lock()
+_server = None
+
+def warm_up():
+    """Load the model, encoders and analytics indexes into this process.
+
+    Runs each step in turn and records how long it took; readiness is only
+    reported once every step has finished. A failing step leaves the
+    process not ready and is logged, since serving without it would just
+    move the failure to the first user.
+    """
+    with _state_lock:
+        _state['status'] = 'warming'
+    start = time.perf_counter()
+    for name, step in STEPS:
+        step_start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            logger.exception("Warm-up step %s failed", name)
+            with _state_lock:
+                _state['status'] = 'failed'
+                _state['error'] = f"{name}: {e}"
+            return False
+        with _state_lock:
+            _state['steps'][name] = round(time.perf_counter() - step_start, 3)
+    with _state_lock:
+        _state['status'] = 'ready'
+        _state['seconds'] = round(time.perf_counter() - start, 3)
+    logger.info("Warm-up finished in %.1fs", _state['seconds'])
+    return True
+
+_warmup_thread = None
+
+def start_warmup():
+    """Start warm-up on a background thread, once per process"""
+    global _warmup_thread
+    with _state_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=warm_up, name='warmup', daemon=True)
+            _warmup_thread.start()
+    return _warmup_thread
+
+def is_ready():
+    return _state['status'] == 'ready'
+
+def readiness():
+    """Copy of the warm-up state: status, per-step seconds and any error"""
+    with _state_lock:
+        return dict(_state, steps=dict(_state['steps']))
+
+class ReadinessHandler(BaseHTTPRequestHandler):
+    """GET /ready (200 once warmed up, 503 before) and GET /health (200 while running)"""
+
+    def do_GET(self):
+        if self.path == '/ready':
+            self._send(200 if is_ready() else 503, readiness())
+        elif self.path == '/health':
+            self._send(200, {'status': 'ok', 'pid': os.getpid()})
+        else:
+            self._send(404, {'error': 'not found'})
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.debug("%s %s", self.address_string(), format % args)
+
+def start_readiness_server(host=READY_HOST, port=READY_PORT):
+    """Serve the readiness probe on a background thread, once per process.
+
+    Streamlit's own /_stcore/health answers as soon as the server is up, so
+    orchestrators should gate traffic on this /ready instead. Returns None
+    if the port is taken, e.g. by another app process on the same host.
+    """
+    global _server
+    with _state_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, port), ReadinessHandler)
+            except OSError as e:
+                logger.warning("Readiness probe not started on %s:%d: %s", host, port, e)
+                _server = False  # don't retry on every rerun of Home.py
+                return None
+            threading.Thread(target=_server.serve_forever, name='readiness', daemon=True).start()
+    return _server or None
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Start PriceGenie with warm-up: the readiness probe reports ready once models and indexes are loaded",
+        epilog="Remaining arguments are passed to `streamlit run`, e.g. --server.port 8501"
+    )
+    parser.add_argument('--ready-host', default=READY_HOST)
+    parser.add_argument('--ready-port', type=int, default=READY_PORT)
+    parser.add_argument('--warm-only', action='store_true', help="Warm up, print the timings and exit")
+    args, streamlit_args = parser.parse_known_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+    # Run as a script this file is `__main__`, while the pages import `warmup`;
+    # warm up and serve readiness from that module so they share its caches and state
+    import warmup
+    if args.warm_only:
+        ok = warmup.warm_up()
+        print(json.dumps(warmup.readiness(), indent=2))
+        sys.exit(0 if ok else 1)
+
+    # Streamlit runs in this process, so everything warmed here is what its sessions use
+    warmup.start_readiness_server(args.ready_host, args.ready_port)
+    warmup.start_warmup()
+    from streamlit.web import cli as stcli
+    sys.argv = ['streamlit', 'run', str(HOME), *streamlit_args]
+    sys.exit(stcli.main())
+
+if __name__ == "__main__":
+    main()
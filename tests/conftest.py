@@ -0,0 +1,53 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'Main'))
+# Keep predictions logged by the code under test out of the repo
+os.environ.setdefault('PRICEGENIE_PREDICTION_LOG', tempfile.mkdtemp(prefix='pricegenie-test-log-'))
+
+LOCATIONS = ['Whitefield', 'HSR Layout', 'Hebbal', 'Kengeri']
+
+@pytest.fixture
+def listings():
+    """Synthetic listings with a linear price and some noise"""
+    rng = np.random.default_rng(0)
+    n = 400
+    location = rng.choice(LOCATIONS, n)
+    bhk = rng.integers(1, 5, n)
+    bath = np.minimum(bhk + rng.integers(0, 2, n), 5)
+    total_sqft = rng.uniform(500, 3000, n).round()
+    premium = pd.Series(location).map(dict(zip(LOCATIONS, [20.0, 35.0, 10.0, -5.0]))).to_numpy()
+    price = 0.06 * total_sqft + 4 * bath + 3 * bhk + premium + rng.normal(0, 5, n)
+    return pd.DataFrame({
+        'location': location, 'size': [f'{b} BHK' for b in bhk], 'total_sqft': total_sqft,
+        'bath': bath.astype(float), 'bhk': bhk, 'price': price,
+    })
+
+@pytest.fixture
+def feature_names():
+    return ['total_sqft', 'bath', 'bhk'] + LOCATIONS
+
+@pytest.fixture
+def model(listings, feature_names):
+    """sklearn LinearRegression in the app's [area, bath, bhk, location_*] layout"""
+    from sklearn.linear_model import LinearRegression
+    X = pd.get_dummies(listings['location']).reindex(columns=LOCATIONS).astype(float)
+    X.insert(0, 'bhk', listings['bhk'].astype(float))
+    X.insert(0, 'bath', listings['bath'])
+    X.insert(0, 'total_sqft', listings['total_sqft'])
+    return LinearRegression().fit(X[feature_names], listings['price'])
+
+@pytest.fixture
+def design(listings, feature_names):
+    """Explicit [1, area, bath, bhk, location_*] design matrix and prices for the listings"""
+    one_hot = pd.get_dummies(listings['location']).reindex(columns=feature_names[3:], fill_value=0)
+    X = np.column_stack([
+        np.ones(len(listings)), listings[['total_sqft', 'bath', 'bhk']].to_numpy(float), one_hot.to_numpy(float)
+    ])
+    return X, listings['price'].to_numpy(float)
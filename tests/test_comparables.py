@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from comparables import FEATURES, build_comparables, load_comparables
+
+@pytest.fixture
+def index(tmp_path, listings):
+    build_comparables(listings, tmp_path)
+    return load_comparables(tmp_path)
+
+def brute_force(listings, location, area, bhk, bath, k):
+    features = listings[list(FEATURES)].to_numpy(dtype=np.float64)
+    scale = features.std(axis=0)
+    in_location = (listings['location'] == location).to_numpy()
+    distances = np.linalg.norm((features[in_location] - [area, bhk, bath]) / scale, axis=1)
+    return np.sort(distances)[:k]
+
+@pytest.mark.parametrize('location, area, bhk, bath', [
+    ('Whitefield', 1200, 2, 2),
+    ('HSR Layout', 2800, 4, 5),
+    ('Hebbal', 450, 1, 1),
+    ('Kengeri', 1650, 3, 2),
+])
+def test_similar_matches_brute_force(index, listings, location, area, bhk, bath):
+    result = index.similar(location, area, bhk, bath, k=7)
+    np.testing.assert_allclose(result['distance'], brute_force(listings, location, area, bhk, bath, 7))
+
+    # The returned rows are real listings in that location at those distances
+    scale = listings[list(FEATURES)].to_numpy(dtype=np.float64).std(axis=0)
+    recomputed = np.linalg.norm((result[list(FEATURES)].to_numpy() - [area, bhk, bath]) / scale, axis=1)
+    np.testing.assert_allclose(result['distance'], recomputed)
+    merged = result.merge(listings[listings['location'] == location], on=list(FEATURES) + ['price'])
+    assert len(merged) >= len(result)
+
+def test_k_larger_than_location(index, listings):
+    count = (listings['location'] == 'Hebbal').sum()
+    assert len(index.similar('Hebbal', 1000, 2, 2, k=count + 10)) == count
+
+def test_unknown_location_is_empty(index):
+    result = index.similar('Nowhere', 1000, 2, 2)
+    assert result.empty
+    assert 'distance' in result.columns
+
+def test_load_missing_index(tmp_path):
+    assert load_comparables(tmp_path / 'missing') is None
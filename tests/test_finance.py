@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from scipy.optimize import brentq
+
+from finance import emi, irr, max_loan, npv, outstanding_balance, property_cash_flows, xirr
+
+def annual_irr_brentq(flows, times):
+    return brentq(lambda r: np.sum(flows * (1 + r) ** -times), -0.99, 10.0, xtol=1e-14)
+
+def test_emi_known_value_and_zero_rate():
+    assert emi(1000000, 8.5, 20) == pytest.approx(8678.23, abs=0.01)
+    assert emi(1200000, 0, 10) == pytest.approx(10000)
+
+def test_max_loan_inverts_emi():
+    principal = np.array([500000.0, 2500000.0, 8000000.0, 1200000.0])
+    rate = np.array([6.5, 8.5, 12.0, 0.0])
+    tenure = np.array([5, 20, 30, 10])
+    np.testing.assert_allclose(max_loan(emi(principal, rate, tenure), rate, tenure), principal, rtol=1e-10)
+
+def test_outstanding_balance_ends_at_zero():
+    assert outstanding_balance(1000000, 8.5, 20, 0) == pytest.approx(1000000)
+    assert outstanding_balance(1000000, 8.5, 20, 240) == pytest.approx(0, abs=1e-6)
+    assert outstanding_balance(1000000, 0, 10, 60) == pytest.approx(500000)
+
+def test_npv_matches_direct_sum():
+    flows = np.array([[-1000.0, 300, 400, 500], [-500.0, 0, 0, 700]])
+    times = np.arange(4) / 12
+    expected = [np.sum(row * 1.07 ** -times) for row in flows]
+    np.testing.assert_allclose(npv(0.07, flows), expected)
+
+def test_irr_matches_brentq_on_random_scenarios():
+    rng = np.random.default_rng(42)
+    n = 200
+    flows = property_cash_flows(
+        purchase_price=rng.uniform(2e6, 2e7, n), down_payment=rng.uniform(10, 100, n),
+        loan_rate=rng.uniform(6, 12, n), tenure=rng.integers(5, 31, n),
+        monthly_rent=rng.uniform(0, 80000, n), years=rng.integers(1, 21, n),
+        sale_price=rng.uniform(1.5e6, 4e7, n),
+    )
+    times = np.arange(flows.shape[1]) / 12
+    rates = irr(flows)
+    checked = 0
+    for row, rate in zip(flows, rates):
+        values = [np.sum(row * (1 + r) ** -times) for r in (-0.99, 10.0)]
+        if np.sign(values[0]) == np.sign(values[1]):
+            assert np.isnan(rate)
+            continue
+        assert rate == pytest.approx(annual_irr_brentq(row, times), abs=1e-8)
+        checked += 1
+    assert checked > 150
+
+def test_irr_without_sign_change_is_nan():
+    flows = np.array([[-100.0, -10, -10], [100.0, 10, 10], [0.0, 0, 0]])
+    assert np.isnan(irr(flows)).all()
+
+@pytest.mark.parametrize('flows', [
+    [-100.0] + [0.0] * 11 + [10.0],      # lose 90% in a year: far below the 10% starting guess
+    [-100.0, 0, 0, 0, 0, 0, 300.0],      # 3x in six months (800% a year): Newton overshoots
+    [-100.0] + [0.0] * 359 + [10000.0],  # one flow 30 years out: steep, strongly convex NPV
+])
+def test_irr_bisection_fallback_converges(flows):
+    flows = np.array(flows)
+    times = np.arange(len(flows)) / 12
+    rate = irr(flows)[0]
+    assert np.isfinite(rate)
+    assert npv(rate, flows)[0] == pytest.approx(0, abs=1e-6)
+    assert rate == pytest.approx(annual_irr_brentq(flows, times), rel=1e-8)
+
+def test_irr_beyond_bracket_is_nan():
+    # 9x in six months is about 8000% a year, outside the (-99%, 1000%) bracket
+    assert np.isnan(irr([-100.0, 0, 0, 0, 0, 0, 900.0])[0])
+
+def test_xirr_matches_brentq():
+    dates = np.array(['2024-01-15', '2024-03-01', '2024-10-20', '2025-06-30'], dtype='datetime64[D]')
+    flows = np.array([-10000.0, 2500, 4000, 5200])
+    times = (dates - dates[0]).astype(float) / 365.0
+    assert xirr(flows, dates)[0] == pytest.approx(annual_irr_brentq(flows, times), abs=1e-9)
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from geo_index import KM_PER_DEGREE, PPSF_BINS, GeoIndex, build_geo_index
+
+CENTRE = (12.97, 77.59)
+
+@pytest.fixture
+def localities():
+    """60 localities scattered within about 10 km of the centre, with their listings"""
+    rng = np.random.default_rng(1)
+    n = 60
+    coordinates = pd.DataFrame({
+        'location': [f'Locality {i}' for i in range(n)],
+        'lat': CENTRE[0] + rng.uniform(-0.09, 0.09, n),
+        'lon': CENTRE[1] + rng.uniform(-0.09, 0.09, n),
+    })
+    rows = rng.integers(5, 30, n)
+    location = np.repeat(coordinates['location'], rows).to_numpy()
+    total_sqft = rng.uniform(600, 2500, len(location)).round()
+    ppsf = np.repeat(rng.uniform(4000, 12000, n), rows) * rng.lognormal(0, 0.2, len(location))
+    listings = pd.DataFrame({
+        'location': location, 'total_sqft': total_sqft, 'bhk': rng.integers(1, 5, len(location)),
+        'price': ppsf * total_sqft / 100000,
+    })
+    listings['price_per_sqft'] = listings['price'] * 100000 / listings['total_sqft']
+    return coordinates, listings
+
+def distances_km(coordinates, lat, lon):
+    scale = np.cos(np.radians(coordinates['lat'].mean())) * KM_PER_DEGREE
+    return np.hypot((coordinates['lon'] - lon) * scale, (coordinates['lat'] - lat) * KM_PER_DEGREE)
+
+@pytest.mark.parametrize('cell_km', [0.5, 1.0, 3.0])
+@pytest.mark.parametrize('offset, radius_km', [((0, 0), 2.0), ((0.03, -0.02), 4.5), ((-0.05, 0.05), 8.0), ((0, 0), 30.0)])
+def test_median_within_matches_exact(localities, cell_km, offset, radius_km):
+    coordinates, listings = localities
+    index = GeoIndex(build_geo_index(listings, coordinates), cell_km)
+    lat, lon = CENTRE[0] + offset[0], CENTRE[1] + offset[1]
+
+    near = coordinates['location'][distances_km(coordinates, lat, lon) <= radius_km]
+    inside = listings[listings['location'].isin(near)]
+    result = index.median_within(lat, lon, radius_km)
+    if inside.empty:
+        assert result is None
+        return
+    median, count = result
+    assert count == len(inside)
+    # Within one histogram bin of the exact median
+    assert median == pytest.approx(inside['price_per_sqft'].median(), rel=PPSF_BINS[1] / PPSF_BINS[0] - 1)
+
+def test_cheapest_near_matches_exact(localities):
+    coordinates, listings = localities
+    index = GeoIndex(build_geo_index(listings, coordinates))
+    lat, lon = CENTRE
+    distance = distances_km(coordinates, lat, lon)
+
+    exact = (
+        listings.groupby('location')['price_per_sqft'].agg(['median', 'count'])
+        .join(coordinates.set_index('location').assign(distance=distance.to_numpy()))
+    )
+    exact = exact[exact['distance'] <= 5].sort_values('median').head(8)
+    result = index.cheapest_near(lat, lon, 5, limit=8)
+
+    assert result['location'].tolist() == exact.index.tolist()
+    np.testing.assert_allclose(result['median_price_per_sqft'], exact['median'], rtol=1e-6)
+    np.testing.assert_allclose(result['distance_km'], exact['distance'], rtol=1e-9)
+    assert result['listings'].tolist() == exact['count'].tolist()
+
+def test_unlocated_listings_are_dropped(localities):
+    coordinates, listings = localities
+    extra = listings.head(3).assign(location='Unmapped Layout')
+    index = build_geo_index(pd.concat([listings, extra]), coordinates)
+    assert 'Unmapped Layout' not in index['location']
+    assert index['count'].sum() == len(listings)
+
+def test_locate_ignores_spelling(localities):
+    coordinates, listings = localities
+    index = GeoIndex(build_geo_index(listings, coordinates))
+    assert index.locate('locality-7') == pytest.approx(tuple(coordinates.loc[7, ['lat', 'lon']]))
+    assert index.locate('Nowhere') is None
@@ -0,0 +1,42 @@
+import pytest
+
+from locality_search import LocalitySearch, popular_locations
+
+NAMES = [
+    '1st Phase JP Nagar', '5th Phase JP Nagar', 'JP Nagar', 'Nagarbhavi',
+    'Indira Nagar', 'Whitefield', 'Electronic City', 'Electronic City Phase II',
+    'Sarjapur  Road', 'Hebbal', 'Hebbal Kempapura',
+]
+
+@pytest.fixture
+def index():
+    return LocalitySearch(NAMES)
+
+@pytest.mark.parametrize('query', ['JP Nagar', 'jp nagar', '  JP-nagar ', 'Jp Nagar'])
+def test_exact_match_wins(index, query):
+    assert index.best_match(query) == 'JP Nagar'
+
+def test_exact_match_beats_earlier_ids_past_the_limit():
+    names = [f'{n}th Phase JP Nagar' for n in range(10, 60)] + ['JP Nagar']
+    assert LocalitySearch(names).best_match('jp nagar') == 'JP Nagar'
+
+def test_prefix_ranks_name_starts_before_word_starts(index):
+    assert index.search('nagar', limit=3) == ['Nagarbhavi', '1st Phase JP Nagar', '5th Phase JP Nagar']
+    assert index.search('hebbal') == ['Hebbal', 'Hebbal Kempapura']
+    assert index.search('electronic', limit=1) == ['Electronic City']
+
+@pytest.mark.parametrize('query, expected', [
+    ('whitefeild', 'Whitefield'),
+    ('indiranagar', 'Indira Nagar'),
+    ('sarjapur road', 'Sarjapur  Road'),
+])
+def test_trigram_fallback_for_typos(index, query, expected):
+    assert index.best_match(query) == expected
+
+def test_no_match(index):
+    assert index.best_match('zzzz') is None
+    assert index.search('') == sorted(NAMES)[:10]
+
+def test_popular_locations_use_vocabulary_spelling():
+    assert popular_locations(NAMES)[:3] == ['Whitefield', 'Electronic City', 'Indira Nagar']
+    assert 'JP Nagar' in popular_locations(NAMES)
@@ -0,0 +1,61 @@
+import json
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+import model_registry
+from model_registry import get_registry, read_shadow_log, reload_registry
+
+@pytest.fixture
+def config(tmp_path, model, monkeypatch):
+    monkeypatch.setattr(model_registry, 'SHADOW_LOG_DIR', tmp_path / 'logs')
+    monkeypatch.setattr(model_registry, '_shadow_log', None)
+    candidate = pickle.loads(pickle.dumps(model))
+    candidate.intercept_ += 1.0
+    for name, m in (('production.pickle', model), ('candidate.pickle', candidate)):
+        with open(tmp_path / name, 'wb') as f:
+            pickle.dump(m, f)
+    path = tmp_path / 'models.json'
+    path.write_text(json.dumps({'production': 'production.pickle', 'candidate': 'candidate.pickle'}))
+    return path
+
+def test_shadow_deltas_are_logged(config, tmp_path):
+    registry = get_registry(config)
+    registry.predict_sparse(np.array([0, 1, 2, 3]), np.array([1000.0, 2, 2, 1]))
+    registry.close()
+    registry._shadow_pool.shutdown(wait=True)
+
+    log = read_shadow_log(tmp_path / 'logs')
+    assert len(log) == 1
+    assert log.loc[0, 'candidate'] == 'candidate.pickle'
+    assert log.loc[0, 'mean_delta'] == pytest.approx(1.0)
+
+def test_replaced_registry_is_closed(config):
+    first = get_registry(config)
+    assert get_registry(config) is first
+
+    stat = config.stat()
+    os.utime(config, (stat.st_atime, stat.st_mtime + 10))
+    second = get_registry(config)
+    assert second is not first
+    assert first._shadow_pool._shutdown
+
+    third = reload_registry(config)
+    assert third is not second
+    assert second._shadow_pool._shutdown
+    third.close()
+
+@pytest.mark.parametrize('content', [None, b'not a pickle'])
+def test_bad_candidate_keeps_production_serving(config, tmp_path, content):
+    candidate = tmp_path / 'candidate.pickle'
+    if content is None:
+        candidate.unlink()
+    else:
+        candidate.write_bytes(content)
+
+    registry = get_registry(config)
+    assert registry.candidate is None
+    assert registry._shadow_pool is None
+    assert registry.predict_sparse(np.array([0, 1, 2, 3]), np.array([1000.0, 2, 2, 1])) > 0
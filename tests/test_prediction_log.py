@@ -0,0 +1,71 @@
+import time
+
+import pandas as pd
+import pytest
+
+import prediction_log
+from prediction_log import PredictionLog, read_predictions
+
+def wait_for_rows(path, rows, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        logged = read_predictions(path)
+        if len(logged) >= rows:
+            return logged
+        time.sleep(0.05)
+    raise AssertionError(f"only {len(logged)} of {rows} rows readable")
+
+def test_record_and_batch_read_back(tmp_path):
+    log = PredictionLog(tmp_path)
+    log.record('app', 'model.pickle', 'Whitefield', 1200, 2, 2, 85.5, 80.0, 91.0)
+    log.record('tk', 'model.pickle', 'Hebbal', 900, 1, 1, 50.0)
+    log.record_batch('bulk', 'model.pickle', pd.DataFrame({
+        'location': ['Kengeri', 'HSR Layout'], 'area': [1000.0, 1500.0],
+        'bhk': [2.0, 3.0], 'bath': [2.0, 3.0], 'price': [45.0, 120.0],
+    }))
+    log.close()
+
+    logged = read_predictions(tmp_path).sort_values('price', ignore_index=True)
+    assert list(logged.columns) == list(prediction_log.COLUMNS)
+    assert list(logged['source']) == ['bulk', 'tk', 'app', 'bulk']
+    assert list(logged['price']) == [45.0, 50.0, 85.5, 120.0]
+    assert logged.loc[2, ['low', 'high']].tolist() == [80.0, 91.0]
+    assert logged.loc[1, ['low', 'high']].isna().all()
+    assert pd.api.types.is_datetime64_any_dtype(logged['timestamp'])
+    assert log.dropped == 0
+
+def test_rotates_by_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(prediction_log, 'BATCH_ROWS', 1)
+    monkeypatch.setattr(prediction_log, 'ROTATE_ROWS', 2)
+    log = PredictionLog(tmp_path)
+    for i in range(5):
+        log.record('app', 'model.pickle', 'Whitefield', 1000 + i, 2, 2, 60.0 + i)
+    log.close()
+
+    assert len(list(tmp_path.glob('predictions-*'))) == 3
+    assert sorted(read_predictions(tmp_path)['area']) == [1000, 1001, 1002, 1003, 1004]
+
+def test_idle_file_rotates_and_is_readable_before_close(tmp_path, monkeypatch):
+    monkeypatch.setattr(prediction_log, 'FLUSH_SECONDS', 0.05)
+    monkeypatch.setattr(prediction_log, 'ROTATE_SECONDS', 0.2)
+    log = PredictionLog(tmp_path)
+    log.record('app', 'model.pickle', 'Whitefield', 1200, 2, 2, 85.5)
+    try:
+        # No close: the writer finishes the file on its own once it's old enough
+        assert wait_for_rows(tmp_path, 1)['price'].tolist() == [85.5]
+    finally:
+        log.close()
+
+def test_csv_fallback(tmp_path, monkeypatch):
+    monkeypatch.setattr(prediction_log, 'pq', None)
+    log = PredictionLog(tmp_path)
+    log.record('app', 'model.pickle', 'Whitefield', 1200, 2, 2, 85.5)
+    # CSV rows are readable as soon as they're flushed
+    log.record_batch('bulk', 'model.pickle', pd.DataFrame({'location': ['Hebbal'], 'price': [50.0]}))
+    log.close()
+
+    assert [file.suffix for file in tmp_path.iterdir()] == ['.csv']
+    assert sorted(read_predictions(tmp_path)['price']) == [50.0, 85.5]
+
+def test_read_predictions_empty_dir(tmp_path):
+    assert list(read_predictions(tmp_path / 'missing').columns) == list(prediction_log.COLUMNS)
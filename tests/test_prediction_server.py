@@ -0,0 +1,86 @@
+import json
+import os
+import pickle
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+SERVER = Path(__file__).parent.parent / 'Main' / 'prediction_server.py'
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'fork'), reason="prefork server needs fork")
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def request(port, path, body=None):
+    data = None if body is None else json.dumps(body).encode()
+    with urllib.request.urlopen(f'http://127.0.0.1:{port}{path}', data=data, timeout=5) as response:
+        return json.loads(response.read())
+
+def wait_until(check, timeout=15):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            result = check()
+            if result:
+                return result
+        except OSError:
+            pass
+        time.sleep(0.1)
+    raise AssertionError("timed out")
+
+def worker_pids(pid):
+    return [int(p) for p in Path(f'/proc/{pid}/task/{pid}/children').read_text().split()]
+
+def cpu_seconds(pid):
+    fields = Path(f'/proc/{pid}/stat').read_text().rsplit(')', 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+@pytest.fixture
+def server(tmp_path, model):
+    with open(tmp_path / 'model.pickle', 'wb') as f:
+        pickle.dump(model, f)
+    config = tmp_path / 'models.json'
+    config.write_text(json.dumps({'production': 'model.pickle'}))
+    port = free_port()
+    proc = subprocess.Popen(
+        [sys.executable, str(SERVER), '--port', str(port), '--workers', '2', '--config', str(config)],
+        cwd=SERVER.parent, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+    )
+    try:
+        wait_until(lambda: request(port, '/health'))
+        yield proc, port
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+def test_serve_roll_and_shutdown(server):
+    proc, port = server
+    body = {'location': 'Whitefield', 'area': 1200, 'bath': 2, 'bhk': 2}
+    price = request(port, '/predict', body)['price']
+    assert price > 0
+
+    workers = worker_pids(proc.pid)
+    assert len(workers) == 2
+    if Path(f'/proc/{workers[0]}/stat').exists():
+        # Idle workers wait in select instead of spinning
+        before = [cpu_seconds(pid) for pid in workers]
+        time.sleep(1.0)
+        assert max(cpu_seconds(pid) - b for pid, b in zip(workers, before)) < 0.2
+
+    proc.send_signal(signal.SIGHUP)
+    wait_until(lambda: set(worker_pids(proc.pid)).isdisjoint(workers) and len(worker_pids(proc.pid)) == 2)
+    assert request(port, '/predict', body)['price'] == pytest.approx(price)
+
+    proc.send_signal(signal.SIGTERM)
+    assert proc.wait(timeout=15) == 0
+    assert 'Rolled 2 workers' in proc.stdout.read()
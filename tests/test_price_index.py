@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from listing_cleaning import clean_csv
+from price_index import (_map_distinct, build_index, load_index, parse_total_sqft, prepare_listings,
+                         save_index)
+
+def test_map_distinct_all_missing():
+    values = pd.Series([np.nan, None, np.nan], dtype=object, index=[5, 6, 7])
+    result = _map_distinct(values, parse_total_sqft)
+    assert result.isna().all()
+    assert list(result.index) == [5, 6, 7]
+
+def test_map_distinct_matches_direct_parse():
+    values = pd.Series(['1200', '1000 - 1400', '2 acres', None, '1200', 'junk'])
+    expected = parse_total_sqft(values)
+    pd.testing.assert_series_equal(_map_distinct(values, parse_total_sqft), expected, check_dtype=False)
+
+def test_prepare_listings_all_blank_size():
+    chunk = pd.DataFrame({
+        'location': ['Whitefield', 'Hebbal'], 'size': [np.nan, np.nan],
+        'total_sqft': ['1200', '900'], 'bath': [2.0, 1.0], 'price': [80.0, 50.0],
+    })
+    assert prepare_listings(chunk).empty
+
+def test_clean_csv_chunk_with_blank_columns(tmp_path, listings):
+    raw = listings.drop(columns='bhk').astype({'total_sqft': object})
+    raw.loc[raw.index[-50:], ['size', 'total_sqft', 'location']] = np.nan
+    source = tmp_path / 'raw.csv'
+    raw.to_csv(source, index=False)
+
+    read, kept = clean_csv([source], tmp_path / 'clean.csv', chunksize=50)
+    assert read == len(raw)
+    assert 0 < kept <= len(raw) - 50
+
+FIXTURE_CSV = """location,size,total_sqft,bath,price
+Whitefield,2 BHK,1000,2,50
+Whitefield,2 BHK,1000,2,60
+Whitefield,2 BHK,1000,2,70
+Whitefield,2 BHK,1000,2,80
+Whitefield,2 BHK,1000,2,90
+Whitefield,3 Bedroom,2000,3,120
+Whitefield,3 BHK,1500 - 2500,3,140
+Hebbal,2 BHK,1000,2,60
+Hebbal,2 BHK,1000,2,65
+Hebbal,2 BHK,1000,2,70
+"""
+
+@pytest.fixture
+def price_index(tmp_path):
+    source = tmp_path / 'listings.csv'
+    source.write_text(FIXTURE_CSV)
+    save_index(build_index(pd.read_csv(source), min_count=5), tmp_path / 'index.npz')
+    return load_index(tmp_path / 'index.npz')
+
+def test_lookup_location_and_bhk(price_index):
+    stats = price_index.lookup('Whitefield', 2)
+    assert stats['count'] == 5
+    assert stats['mean'] == pytest.approx(7000)
+    assert stats['median'] == pytest.approx(7000)
+    assert stats['percentiles'][10] == pytest.approx(5400)
+
+def test_lookup_falls_back_to_whole_location(price_index):
+    # Only two 3 BHK listings, below min_count, so the all-configurations row answers
+    everything = price_index.lookup('Whitefield')
+    assert everything['count'] == 7
+    assert everything['mean'] == pytest.approx((5000 + 6000 + 7000 + 8000 + 9000 + 6000 + 7000) / 7)
+    assert price_index.lookup('Whitefield', 3) == everything
+    assert price_index.lookup('Whitefield', 4) == everything
+
+def test_lookup_misses(price_index):
+    assert price_index.lookup('Hebbal') is None  # three listings, below min_count
+    assert price_index.lookup('Hebbal', 2) is None
+    assert price_index.lookup('Nowhere', 2) is None
+    assert len(price_index) == 2
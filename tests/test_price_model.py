@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from price_model import (batch_predict, float32_error, prediction_interval, price_curves, scoring_dtype,
+                         sparse_predict)
+from train_model import NormalEquations
+
+def frame(model, rows):
+    return pd.DataFrame(rows, columns=model.feature_names_in_)
+
+def test_sparse_predict_matches_sklearn(model):
+    x = np.zeros(model.n_features_in_)
+    x[[0, 1, 2, 5]] = [1400.0, 2.0, 3.0, 1.0]
+    nonzero = np.flatnonzero(x)
+    assert sparse_predict(model, nonzero, x[nonzero]) == pytest.approx(model.predict(frame(model, [x]))[0])
+    # Columns past the model's width (extended attributes) are ignored
+    extra = np.append(nonzero, model.n_features_in_ + 2)
+    assert sparse_predict(model, extra, np.append(x[nonzero], 1.0)) == pytest.approx(
+        sparse_predict(model, nonzero, x[nonzero]))
+
+def test_batch_predict_matches_sklearn(model):
+    areas, baths, bhks = np.array([900.0, 1500.0, 2400.0]), np.array([1.0, 2.0, 3.0]), np.array([1, 2, 4])
+    loc_indices = np.array([0, 3, -1])
+    X = np.zeros((3, model.n_features_in_))
+    X[:, :3] = np.column_stack([areas, baths, bhks])
+    X[[0, 1], [3 + 0, 3 + 3]] = 1.0  # -1 leaves the row without a location
+    np.testing.assert_allclose(batch_predict(model, areas, baths, bhks, loc_indices),
+                               model.predict(frame(model, X)))
+
+def test_price_curves_match_batch_predict(model):
+    areas = np.linspace(600, 3000, 7)
+    curves = price_curves(model, [0, 2], areas, 2, 2)
+    for row, loc in enumerate([0, 2]):
+        n = len(areas)
+        np.testing.assert_allclose(curves[row], batch_predict(model, areas, np.full(n, 2), np.full(n, 2), np.full(n, loc)))
+
+def test_prediction_interval_matches_direct_computation(listings, feature_names, design):
+    stats_ = NormalEquations(feature_names)
+    stats_.update(listings)
+    model = stats_.to_model()
+    X, y = design
+
+    x = np.zeros(model.n_features_in_)
+    x[[0, 1, 2, 4]] = [1200.0, 2.0, 2.0, 1.0]
+    z = np.concatenate([[1.0], x])
+    beta = np.concatenate([[model.intercept_], model.coef_])
+    residuals = y - X @ beta
+    dof = len(y) - np.linalg.matrix_rank(X)
+    sigma2 = residuals @ residuals / dof
+    margin = stats.t.ppf(0.975, dof) * np.sqrt(sigma2 * (1 + z @ np.linalg.pinv(X.T @ X) @ z))
+
+    low, high = prediction_interval(model, x)
+    assert (low, high) == pytest.approx((z @ beta - margin, z @ beta + margin), rel=1e-6)
+
+def test_prediction_interval_needs_covariance(model):
+    assert prediction_interval(model, np.ones(model.n_features_in_)) is None
+
+def test_scoring_dtype_guardrail(model, caplog):
+    assert float32_error(model) < 1e-3
+    assert scoring_dtype(model) is np.float64
+    assert scoring_dtype(model, float32=True) is np.float32
+    assert scoring_dtype(model, float32=True, max_error=1e-12) is np.float64
+    assert 'float32 scoring refused' in caplog.text
+
+def test_float32_batch_predict_is_close(model):
+    rng = np.random.default_rng(1)
+    n = 1000
+    args = rng.uniform(500, 3000, n), rng.integers(1, 4, n), rng.integers(1, 5, n), rng.integers(-1, 4, n)
+    reduced = batch_predict(model, *args, dtype=np.float32)
+    assert reduced.dtype == np.float32
+    np.testing.assert_allclose(reduced, batch_predict(model, *args), atol=1e-3)
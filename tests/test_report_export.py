@@ -0,0 +1,81 @@
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from report_export import (EXPORT_FORMATS, REPORT_MAX_AGE, PortfolioScorer, export_report, read_portfolio,
+                           sweep_reports, take_report)
+
+def portfolio(rows):
+    return pd.DataFrame({
+        'location': ['Whitefield'] * rows,
+        'total_sqft': np.full(rows, 1200),
+        'bhk': np.full(rows, 2),
+        'bath': np.full(rows, 2),
+    })
+
+@pytest.mark.parametrize('fmt', list(EXPORT_FORMATS))
+def test_blank_cell_in_later_chunk(tmp_path, model, fmt):
+    df = portfolio(15001)
+    df['total_sqft'] = df['total_sqft'].astype(object)
+    df.loc[15000, 'total_sqft'] = ''
+    source = tmp_path / 'portfolio.csv'
+    df.to_csv(source, index=False)
+
+    scorer = PortfolioScorer(model)
+    path, rows = export_report(scorer.score_chunks(read_portfolio(source, chunksize=5000)), fmt,
+                               tmp_path / f'report.{EXPORT_FORMATS[fmt][0]}')
+    assert rows == 15001
+    if fmt == 'Parquet':
+        report = pd.read_parquet(path)
+        assert len(report) == 15001
+        assert report['total_sqft'].isna().sum() == 1
+
+def test_failed_export_removes_temporary_file(tmp_path, model, monkeypatch):
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+
+    def chunks():
+        yield portfolio(10)
+        raise ValueError("bad chunk")
+
+    scorer = PortfolioScorer(model)
+    with pytest.raises(ValueError):
+        export_report(scorer.score_chunks(chunks()), 'CSV')
+    assert list(tmp_path.iterdir()) == []
+
+def test_take_report_deletes_file(tmp_path, model, monkeypatch):
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+    path, _ = export_report(PortfolioScorer(model).score_chunks([portfolio(3)]), 'CSV')
+    assert take_report(path).startswith(b'location')
+    assert not Path(path).exists()
+
+def test_unknown_location_has_no_price(model):
+    df = portfolio(2)
+    df.loc[1, 'location'] = 'Nowhere Nagar'
+    df['purchase_price'] = 5000000.0
+    df['monthly_rent'] = 20000.0
+    scored = PortfolioScorer(model).score(df)
+
+    assert scored['known_location'].tolist() == [True, False]
+    assert scored.loc[0, ['predicted_price_lakhs', 'monthly_emi', 'roi_pct']].notna().all()
+    assert scored.loc[1, ['predicted_price_lakhs', 'price_per_sqft', 'monthly_emi', 'roi_pct']].isna().all()
+    # Rental yield only needs the purchase price and rent
+    assert scored.loc[1, 'rental_yield_pct'] == pytest.approx(4.8)
+
+def test_old_temporary_reports_are_swept(tmp_path, model, monkeypatch):
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+    stale, _ = export_report(PortfolioScorer(model).score_chunks([portfolio(3)]), 'CSV')
+    old = time.time() - REPORT_MAX_AGE - 60
+    os.utime(stale, (old, old))
+    other = tmp_path / 'unrelated.csv'
+    other.write_text('x')
+    os.utime(other, (old, old))
+
+    fresh, _ = export_report(PortfolioScorer(model).score_chunks([portfolio(3)]), 'CSV')
+    assert not Path(stale).exists()
+    assert Path(fresh).exists() and other.exists()
+    assert sweep_reports() == 0
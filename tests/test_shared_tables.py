@@ -0,0 +1,22 @@
+import numpy as np
+
+from shared_tables import attach_model, publish_tables
+
+def generations(path):
+    return sorted(p for p in path.parent.glob(path.name + '.*') if p.is_dir() and not p.is_symlink())
+
+def test_previous_generation_survives_one_publish(tmp_path, model):
+    path = tmp_path / 'tables'
+    publish_tables(model, path=path)
+    first = path.resolve()
+
+    publish_tables(model, path=path)
+    # A process that resolved the link before the swap can still attach
+    attached = attach_model(first)
+    np.testing.assert_array_equal(attached.coef_, model.coef_)
+    assert len(generations(path)) == 2
+
+    publish_tables(model, path=path)
+    assert not first.exists()
+    assert len(generations(path)) == 2
+    np.testing.assert_array_equal(attach_model(path).coef_, model.coef_)
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression, Ridge
+
+from train_model import NormalEquations, accumulate, accumulate_parallel
+
+def fitted(listings, feature_names, alpha):
+    stats = NormalEquations(feature_names)
+    stats.update(listings)
+    return stats.to_model(alpha)
+
+@pytest.mark.parametrize('alpha', [0.0, 5.0])
+def test_uncertainty_matches_direct_computation(listings, feature_names, design, alpha):
+    model = fitted(listings, feature_names, alpha)
+    X, y = design
+    # The intercept is not penalised, and the one-hot block plus intercept is
+    # collinear, hence pinv for the plain least-squares case
+    penalty = alpha * np.diag([0.0] + [1.0] * (X.shape[1] - 1))
+    inverse = np.linalg.pinv(X.T @ X + penalty)
+    beta = inverse @ X.T @ y
+    residuals = y - X @ beta
+    hat_trace = np.trace(X @ inverse @ X.T)
+    dof = len(y) - (hat_trace if alpha else np.linalg.matrix_rank(X))
+    sigma2 = residuals @ residuals / dof
+
+    np.testing.assert_allclose(np.concatenate([[model.intercept_], model.coef_]), beta, rtol=1e-6, atol=1e-6)
+    assert model.dof_ == pytest.approx(dof)
+    assert model.sigma2_ == pytest.approx(sigma2, rel=1e-6)
+    np.testing.assert_allclose(
+        model.sigma2_ * model.covariance_, sigma2 * inverse @ X.T @ X @ inverse, rtol=1e-5, atol=1e-6
+    )
+
+def test_least_squares_matches_sklearn(listings, feature_names, design):
+    model = fitted(listings, feature_names, 0.0)
+    X, y = design
+    features = pd.DataFrame(X[:, 1:], columns=feature_names)
+    reference = LinearRegression().fit(features, y)
+    # The one-hot block is collinear with the intercept, so compare predictions
+    np.testing.assert_allclose(model.predict(features), reference.predict(features), rtol=1e-7)
+
+def test_ridge_matches_sklearn(listings, feature_names, design):
+    model = fitted(listings, feature_names, 3.0)
+    X, y = design
+    reference = Ridge(alpha=3.0).fit(X[:, 1:], y)
+    np.testing.assert_allclose(model.coef_, reference.coef_, rtol=1e-6, atol=1e-9)
+    assert model.intercept_ == pytest.approx(reference.intercept_, rel=1e-6)
+
+def test_chunked_and_merged_statistics_are_exact(tmp_path, listings, feature_names):
+    whole = NormalEquations(feature_names)
+    whole.update(listings)
+
+    paths = []
+    for i, start in enumerate(range(0, len(listings), 150)):
+        part = listings.iloc[start:start + 150]
+        paths.append(tmp_path / f'part{i}.csv')
+        part.to_csv(paths[-1], index=False)
+    chunked = accumulate(paths, feature_names, chunksize=37)
+    merged, report = accumulate_parallel(paths, feature_names, chunksize=50, workers=2)
+
+    for stats in (chunked, merged):
+        assert stats.n == whole.n
+        np.testing.assert_allclose(stats.xtx, whole.xtx, rtol=1e-12)
+        np.testing.assert_allclose(stats.xty, whole.xty, rtol=1e-12)
+        assert stats.yty == pytest.approx(whole.yty, rel=1e-12)
+
+def test_merge_rejects_different_layouts(feature_names):
+    with pytest.raises(ValueError):
+        NormalEquations(feature_names).merge(NormalEquations(feature_names[:-1]))